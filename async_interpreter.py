@@ -0,0 +1,109 @@
+import asyncio
+import inspect
+
+from lexical_analyzer import tokenize_lolcode
+from syntax_analyzer import NodeType, ASTNode, SymbolTable, LOLCODESyntaxAnalyzer
+from semantics_analyzer import ASTInterpreter, SemanticAnalyzer
+from input_providers import AsyncQueueInputProvider
+
+# Statements and loop iterations a session runs before giving the event loop a turn
+YIELD_EVERY = 100
+
+class AsyncInterpreter(ASTInterpreter):
+    """
+    ASTInterpreter for running many programs on one asyncio event loop. GIMMEH
+    awaits the input provider (an AsyncInputProvider, though a plain InputProvider
+    also works), and every `yield_every` statements or loop iterations the session
+    yields to the loop, so a long computation doesn't starve the others. A session
+    waiting for input holds nothing but its own interpreter state.
+
+    Control flow comes from the ASTInterpreter helpers (select_if_branch,
+    switch_bodies, loop_bodies, enter_function); only blocks that can contain
+    statements are run here, everything else goes to ASTInterpreter.interpret().
+    """
+
+    def __init__(self, ast: ASTNode, symbol_table: SymbolTable, input_provider=None, output=None,
+                 yield_every=YIELD_EVERY, limits=None):
+        super().__init__(ast, symbol_table, input_provider=input_provider or AsyncQueueInputProvider(),
+                         output=output, limits=limits)
+        self.yield_every = max(1, yield_every)
+        self.steps = 0
+
+    async def run(self):
+        """Run the whole program and flush its output."""
+        try:
+            await self.interpret_async(self.ast)
+        finally:
+            self.output.flush()
+
+    async def tick(self):
+        self.steps += 1
+        if self.steps % self.yield_every == 0:
+            await asyncio.sleep(0)
+
+    async def interpret_async(self, node: ASTNode):
+        if not node:
+            raise ValueError("Node is None during interpretation.")
+
+        node_type = node.node_type
+        if node_type == NodeType.PROGRAM or node_type == NodeType.STATEMENT_LIST:
+            limits = self.limits
+            for child in node.children:
+                if limits is not None:
+                    limits.step(self.symbol_table)
+                await self.interpret_async(child)
+                await self.tick()
+
+        elif node_type == NodeType.INPUT:
+            var_name = node.value
+            if not self.input_provider.pending:
+                self.output.flush()  # Show any prompt before waiting for input
+            entry = self.input_provider.read(var_name)
+            if inspect.isawaitable(entry):
+                entry = await entry
+            self.store_input(var_name, entry)
+
+        elif node_type == NodeType.IF_ELSE:
+            statement_list_node = self.select_if_branch(node)
+            if statement_list_node is not None:
+                await self.interpret_async(statement_list_node)
+
+        elif node_type == NodeType.SWITCH_CASE:
+            for statement_list_node in self.switch_bodies(node):
+                await self.interpret_async(statement_list_node)
+
+        elif node_type == NodeType.LOOP:
+            for statement_list_node in self.loop_bodies(node):
+                await self.interpret_async(statement_list_node)
+                await self.tick()  # Also covers loops with an empty body
+
+        elif node_type == NodeType.FUNCTION_CALL:
+            body, local_scope = self.enter_function(node)
+            try:
+                await self.interpret_async(body)
+            finally:
+                self.symbol_table = local_scope
+
+        else:
+            # Straight-line statements never wait, so the synchronous code runs them
+            self.interpret(node)
+
+async def run_source(source_code, input_provider=None, output=None, yield_every=YIELD_EVERY, limits=None):
+    """
+    Lex, parse, check and run one program as an asyncio session. Semantic errors
+    are raised as a ValueError listing them; runtime errors propagate unchanged.
+    Returns the interpreter, whose symbol_table holds the final variables.
+    """
+    tokens = tokenize_lolcode(source_code)
+    syntax_analyzer = LOLCODESyntaxAnalyzer(tokens)
+    ast = syntax_analyzer.parse_program()
+    symbol_table = syntax_analyzer.symbol_table
+
+    semantic_analyzer = SemanticAnalyzer(ast, symbol_table)
+    if not semantic_analyzer.analyze():
+        raise ValueError("; ".join(semantic_analyzer.errors))
+
+    interpreter = AsyncInterpreter(ast, symbol_table, input_provider=input_provider, output=output,
+                                   yield_every=yield_every, limits=limits)
+    await interpreter.run()
+    return interpreter
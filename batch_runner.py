@@ -0,0 +1,142 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import lolcode_cli
+from execution_limits import parse_size
+
+CLI_PATH = os.path.abspath(lolcode_cli.__file__)
+
+# lolcode_cli exit status -> report status
+STATUSES = {
+    lolcode_cli.EXIT_OK: 'ok',
+    lolcode_cli.EXIT_RUNTIME_ERROR: 'runtime_error',
+    lolcode_cli.EXIT_USAGE: 'error',
+    lolcode_cli.EXIT_SYNTAX_ERROR: 'syntax_error',
+    lolcode_cli.EXIT_SEMANTIC_ERROR: 'semantic_error',
+    lolcode_cli.EXIT_RESOURCE_LIMIT: 'resource_limit',
+}
+
+# Share of --timeout a program may run before the interpreter stops it; the
+# rest covers process startup, and the timeout itself still kills stragglers
+TIME_LIMIT_FRACTION = 0.9
+
+REPORT_FIELDS = ['file', 'status', 'exit_code', 'wall_time', 'stdout', 'stderr']
+
+def collect_programs(patterns):
+    """Expand files, directories (searched recursively) and glob patterns into .lol paths."""
+    programs = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '**', '*.lol'), recursive=True)
+        elif os.path.exists(pattern):
+            matches = [pattern]
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        for path in sorted(matches):
+            if path not in seen:
+                seen.add(path)
+                programs.append(path)
+    return programs
+
+def input_file_for(program, input_dir=None):
+    """GIMMEH input for a program: <name>.in beside it, or in input_dir if given."""
+    base = os.path.splitext(os.path.basename(program))[0] + '.in'
+    path = os.path.join(input_dir, base) if input_dir else os.path.splitext(program)[0] + '.in'
+    return path if os.path.isfile(path) else None
+
+def run_program(program, timeout, input_dir=None, cli_args=()):
+    """Run one program in its own interpreter process and return its report row."""
+    input_path = input_file_for(program, input_dir)
+    stdin = open(input_path, 'rb') if input_path else subprocess.DEVNULL
+    start = time.perf_counter()
+    try:
+        result = subprocess.run([sys.executable, CLI_PATH, *cli_args, program], stdin=stdin,
+                                capture_output=True, timeout=timeout)
+        status = STATUSES.get(result.returncode, 'error')
+        exit_code = result.returncode
+        stdout, stderr = result.stdout, result.stderr
+    except subprocess.TimeoutExpired as e:
+        # subprocess.run has already killed the child
+        status = 'timeout'
+        exit_code = None
+        stdout, stderr = e.stdout or b'', e.stderr or b''
+    finally:
+        if input_path:
+            stdin.close()
+    return {
+        'file': program,
+        'status': status,
+        'exit_code': exit_code,
+        'wall_time': round(time.perf_counter() - start, 4),
+        'stdout': stdout.decode('utf-8', 'replace'),
+        'stderr': stderr.decode('utf-8', 'replace'),
+    }
+
+def run_batch(programs, jobs=None, timeout=10.0, input_dir=None, cli_args=()):
+    """
+    Run programs concurrently, at most `jobs` at a time. Rows keep the input order.
+    `cli_args` are passed to lolcode_cli for every program, e.g. ['--max-steps', '100000'].
+    """
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        return list(pool.map(lambda program: run_program(program, timeout, input_dir, cli_args), programs))
+
+def write_report(rows, out, report_format):
+    if report_format == 'csv':
+        writer = csv.DictWriter(out, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        json.dump(rows, out, indent=2)
+        out.write('\n')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run many LOLCODE programs in parallel and report the results.")
+    parser.add_argument('paths', nargs='+', help="program files, directories or glob patterns (e.g. 'project-testcases/*.lol')")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="programs to run at once (default: CPU count)")
+    parser.add_argument('--timeout', type=float, default=10.0, help="seconds before a program is killed (default: 10)")
+    parser.add_argument('--input-dir', default=None, help="directory holding <name>.in GIMMEH input files "
+                                                          "(default: next to each program)")
+    parser.add_argument('--max-steps', type=int, default=None, metavar='N',
+                        help="stop each program after N steps: statements run, loop iterations and function calls")
+    parser.add_argument('--max-memory', type=parse_size, default=None, metavar='SIZE',
+                        help="stop each program once its variables hold more than SIZE bytes (e.g. 64M)")
+    parser.add_argument('--format', choices=['json', 'csv'], default='json', help="report format (default: json)")
+    parser.add_argument('-o', '--output', default=None, help="write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    programs = collect_programs(args.paths)
+    if not programs:
+        print("Error: no .lol programs found", file=sys.stderr)
+        return 2
+
+    # The interpreter stops itself just before the timeout, so the output so far is kept
+    cli_args = ['--time-limit', str(args.timeout * TIME_LIMIT_FRACTION)]
+    if args.max_steps is not None:
+        cli_args += ['--max-steps', str(args.max_steps)]
+    if args.max_memory is not None:
+        cli_args += ['--max-memory', str(args.max_memory)]
+
+    start = time.perf_counter()
+    rows = run_batch(programs, jobs=args.jobs, timeout=args.timeout, input_dir=args.input_dir, cli_args=cli_args)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, 'w', newline='') as out:
+            write_report(rows, out, args.format)
+    else:
+        write_report(rows, sys.stdout, args.format)
+
+    failed = sum(1 for row in rows if row['status'] != 'ok')
+    print(f"{len(rows)} programs, {len(rows) - failed} ok, {failed} failed, {elapsed:.2f}s", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
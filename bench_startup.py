@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULES = ['lexical_analyzer', 'syntax_analyzer', 'semantics_analyzer', 'lolcode_cli']
+
+# Child script: import the module and report whether any Tk module came with it
+PROBE = "import sys; import {module}; sys.stdout.write(str(any(m.startswith('tkinter') for m in sys.modules)))"
+
+def time_process(code, cwd, env=None):
+    """Wall time in seconds of one fresh interpreter running `code`, plus its stdout."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, result.stdout
+
+def measure(modules, runs, cwd, bytecode_cache=True):
+    """Median and minimum cold start time of each module, net of bare interpreter startup."""
+    env = dict(os.environ)
+    if bytecode_cache:
+        # Measure what a deployed install sees: .pyc files present and up to date
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        for module in modules:
+            time_process(PROBE.format(module=module), cwd, env)
+    else:
+        env['PYTHONDONTWRITEBYTECODE'] = '1'
+
+    bare = [time_process('pass', cwd, env)[0] for _ in range(runs)]
+    bare_median = statistics.median(bare)
+    report = {'python': sys.version.split()[0], 'runs': runs,
+              'interpreter_startup_ms': round(bare_median * 1000, 2), 'modules': {}}
+
+    for module in modules:
+        samples = []
+        loads_tk = False
+        for _ in range(runs):
+            elapsed, output = time_process(PROBE.format(module=module), cwd, env)
+            samples.append(elapsed)
+            loads_tk = output == 'True'
+        median = statistics.median(samples)
+        report['modules'][module] = {
+            'median_ms': round(median * 1000, 2),
+            'min_ms': round(min(samples) * 1000, 2),
+            'import_ms': round((median - bare_median) * 1000, 2),
+            'loads_tkinter': loads_tk,
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold import time of the interpreter modules.")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help="modules to import (default: the engine modules)")
+    parser.add_argument('--runs', type=int, default=20, help="fresh processes per module (default: 20)")
+    parser.add_argument('--no-bytecode-cache', action='store_true',
+                        help="don't write .pyc files first (times include compiling the sources)")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = measure(args.modules, args.runs, os.path.dirname(os.path.abspath(__file__)),
+                     bytecode_cache=not args.no_bytecode_cache)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Python {report['python']}, {report['runs']} runs each, "
+          f"bare interpreter startup {report['interpreter_startup_ms']} ms")
+    print(f"{'module':<22}{'median ms':>11}{'min ms':>9}{'import ms':>11}  tkinter")
+    for module, stats in report['modules'].items():
+        print(f"{module:<22}{stats['median_ms']:>11}{stats['min_ms']:>9}{stats['import_ms']:>11}  "
+              f"{'yes' if stats['loads_tkinter'] else 'no'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from io import StringIO
+
+from lexical_analyzer import tokenize_lolcode
+from syntax_analyzer import LOLCODESyntaxAnalyzer
+from semantics_analyzer import ASTInterpreter, SemanticAnalyzer
+from input_providers import QueueInputProvider
+from output_sinks import StreamOutputSink
+
+PHASES = ('lex', 'parse', 'analyze', 'interpret')
+
+class Program:
+    """A source file plus its GIMMEH input, with helpers to rebuild each phase's input."""
+
+    def __init__(self, path, input_path=None):
+        self.path = path
+        with open(path) as file:
+            self.source_code = file.read()
+        if input_path is None and os.path.isfile(os.path.splitext(path)[0] + '.in'):
+            input_path = os.path.splitext(path)[0] + '.in'
+        self.input_lines = []
+        if input_path:
+            with open(input_path) as file:
+                self.input_lines = file.read().splitlines()
+        self.tokens = tokenize_lolcode(self.source_code)
+
+    def parse(self):
+        syntax_analyzer = LOLCODESyntaxAnalyzer(self.tokens)
+        return syntax_analyzer.parse_program(), syntax_analyzer.symbol_table
+
+    def analyzed(self):
+        ast, symbol_table = self.parse()
+        SemanticAnalyzer(ast, symbol_table).analyze()
+        return ast, symbol_table
+
+    def phase(self, name):
+        """
+        Return (setup, run) for a phase: setup() builds fresh input outside the timed
+        region and run(state) performs exactly the work being measured.
+        """
+        if name == 'lex':
+            return (lambda: self.source_code), tokenize_lolcode
+        if name == 'parse':
+            return (lambda: LOLCODESyntaxAnalyzer(self.tokens)), (lambda analyzer: analyzer.parse_program())
+        if name == 'analyze':
+            return (lambda: SemanticAnalyzer(*self.parse())), (lambda analyzer: analyzer.analyze())
+        if name == 'interpret':
+            def setup():
+                ast, symbol_table = self.analyzed()
+                # Program output is collected in memory so terminal speed doesn't skew the numbers
+                return ASTInterpreter(ast, symbol_table, input_provider=QueueInputProvider(self.input_lines),
+                                      output=StreamOutputSink(StringIO()))
+            def run(interpreter):
+                interpreter.interpret(interpreter.ast)
+                interpreter.output.flush()
+            return setup, run
+        raise ValueError(f"Unknown phase: {name}")
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def measure_phase(program, name, warmup, iterations):
+    setup, run = program.phase(name)
+    for _ in range(warmup):
+        run(setup())
+
+    samples = []
+    for _ in range(iterations):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        samples.append(time.perf_counter() - start)
+
+    # Peak memory comes from a separate run, since tracing would distort the timings
+    state = setup()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'median_ms': statistics.median(samples) * 1000,
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'min_ms': samples[0] * 1000,
+        'p90_ms': percentile(samples, 0.90) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+        'max_ms': samples[-1] * 1000,
+        'peak_memory_kib': peak / 1024,
+    }
+
+def run_benchmarks(paths, phases, warmup, iterations, input_path=None):
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'warmup': warmup,
+        'programs': {},
+    }
+    for path in paths:
+        program = Program(path, input_path)
+        results['programs'][path] = {name: measure_phase(program, name, warmup, iterations) for name in phases}
+    return results
+
+def print_results(results):
+    for path, phases in results['programs'].items():
+        print(path)
+        print(f"  {'phase':<10}{'median ms':>11}{'p90 ms':>10}{'p99 ms':>10}{'peak KiB':>11}")
+        for name, stats in phases.items():
+            print(f"  {name:<10}{stats['median_ms']:>11.3f}{stats['p90_ms']:>10.3f}"
+                  f"{stats['p99_ms']:>10.3f}{stats['peak_memory_kib']:>11.1f}")
+
+def compare(before, after):
+    """Print the median and peak memory change for every program and phase in both files."""
+    print(f"{'program':<36}{'phase':<10}{'before ms':>11}{'after ms':>10}{'change':>9}{'peak KiB':>18}")
+    for path, phases in after['programs'].items():
+        old_phases = before['programs'].get(path)
+        if old_phases is None:
+            continue
+        for name, stats in phases.items():
+            old = old_phases.get(name)
+            if old is None:
+                continue
+            change = (stats['median_ms'] / old['median_ms'] - 1) * 100 if old['median_ms'] else 0.0
+            memory = f"{old['peak_memory_kib']:.0f} -> {stats['peak_memory_kib']:.0f}"
+            print(f"{os.path.basename(path):<36}{name:<10}{old['median_ms']:>11.3f}"
+                  f"{stats['median_ms']:>10.3f}{change:>+8.1f}%{memory:>18}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the lexer, parser, semantic analyzer and interpreter separately.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="benchmark one or more programs")
+    run_parser.add_argument('programs', nargs='+', help="LOLCODE source files")
+    run_parser.add_argument('--input', default=None, help="GIMMEH input file (default: <program>.in if present)")
+    run_parser.add_argument('--phases', default=','.join(PHASES), help=f"comma-separated subset of {','.join(PHASES)}")
+    run_parser.add_argument('--warmup', type=int, default=3, help="untimed iterations per phase (default: 3)")
+    run_parser.add_argument('-n', '--iterations', type=int, default=20, help="timed iterations per phase (default: 20)")
+    run_parser.add_argument('-o', '--output', default=None, help="write the JSON results to this file")
+    run_parser.add_argument('--json', action='store_true', help="print JSON instead of a table")
+
+    compare_parser = subparsers.add_parser('compare', help="compare two result files")
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        with open(args.before) as file:
+            before = json.load(file)
+        with open(args.after) as file:
+            after = json.load(file)
+        compare(before, after)
+        return 0
+
+    phases = [name.strip() for name in args.phases.split(',') if name.strip()]
+    unknown = [name for name in phases if name not in PHASES]
+    if unknown:
+        parser.error(f"unknown phase(s): {', '.join(unknown)}")
+
+    results = run_benchmarks(args.programs, phases, args.warmup, args.iterations, args.input)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+            file.write('\n')
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
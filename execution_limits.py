@@ -0,0 +1,103 @@
+import math
+import sys
+import time
+
+# Steps between wall-clock checks
+CLOCK_EVERY = 100
+
+# Most steps, and longest time in seconds, between two measurements of memory in use
+MEMORY_CHECK_MAX_STEPS = 1 << 16
+MEMORY_CHECK_SECONDS = 0.05
+
+# Suffixes accepted by parse_size()
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+class ResourceExhausted(RuntimeError):
+    """A program ran past one of its ExecutionLimits. `resource` is 'steps', 'time' or 'memory'."""
+
+    def __init__(self, resource, message):
+        super().__init__(message)
+        self.resource = resource
+
+def parse_size(text):
+    """Parse a byte count such as 65536, 512K, 64M or 1G."""
+    text = str(text).strip().upper().rstrip('B')
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ''
+    return int(float(text[:len(text) - len(unit)]) * SIZE_UNITS[unit])
+
+def value_memory(symbol_table):
+    """Approximate bytes held by the variables in the current scope."""
+    return sum(sys.getsizeof(cell.value) for cell in symbol_table.variables.values())
+
+class ExecutionLimits:
+    """
+    Budgets for one run, passed to the interpreter as `limits`. A step is one
+    statement run, plus one per loop iteration and function call so that a loop
+    with an empty body still uses up steps. The step count is checked on every
+    step and the clock every CLOCK_EVERY steps. With a memory cap the variables
+    in scope are measured after a number of steps that shrinks as they near the
+    cap, so a value that even quadruples every step is caught within a few
+    multiples of it. While they stay under a quarter of the cap and at most
+    double between measurements, the number of steps doubles each time, up to
+    MEMORY_CHECK_MAX_STEPS, and they are measured at least every
+    MEMORY_CHECK_SECONDS; a cap far above what the program uses costs almost
+    nothing.
+    A limit of None is not checked at all.
+    """
+
+    def __init__(self, max_steps=None, max_seconds=None, max_memory=None, clock_every=CLOCK_EVERY):
+        self.max_steps = max_steps
+        self.max_seconds = max_seconds
+        self.max_memory = max_memory
+        self.clock_every = max(1, clock_every)
+        self.steps = 0
+        self.start()
+
+    def start(self):
+        """Start counting again, e.g. when the interpreter begins a run."""
+        self.steps = 0
+        self.deadline = None if self.max_seconds is None else time.monotonic() + self.max_seconds
+        self.next_memory_check = 1
+        self.next_memory_time = time.monotonic() + MEMORY_CHECK_SECONDS
+        self.memory_interval = 1    # steps from one measurement to the next
+        self.last_memory = None     # bytes in variables at the last measurement
+        self.plan_next_check()
+
+    def plan_next_check(self):
+        next_check = float('inf')
+        if self.deadline is not None or self.max_memory is not None:
+            next_check = self.steps + self.clock_every
+        if self.max_steps is not None:
+            next_check = min(next_check, self.max_steps + 1)
+        if self.max_memory is not None:
+            next_check = min(next_check, self.next_memory_check)
+        self.next_check = next_check
+
+    def step(self, symbol_table):
+        self.steps += 1
+        if self.steps >= self.next_check:
+            self.check(symbol_table)
+
+    def check(self, symbol_table):
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise ResourceExhausted('steps', f"Step limit of {self.max_steps} statements, loop iterations and calls exceeded")
+        if self.deadline is not None or self.max_memory is not None:
+            now = time.monotonic()
+            if self.deadline is not None and now > self.deadline:
+                raise ResourceExhausted('time', f"Time limit of {self.max_seconds:g} seconds exceeded")
+            if self.max_memory is not None and (self.steps >= self.next_memory_check or now >= self.next_memory_time):
+                self.check_memory(symbol_table)
+        self.plan_next_check()
+
+    def check_memory(self, symbol_table):
+        used = value_memory(symbol_table)
+        if used > self.max_memory:
+            raise ResourceExhausted('memory', f"Memory limit of {self.max_memory} bytes exceeded ({used} bytes in variables)")
+        if self.last_memory is not None and used <= 2 * self.last_memory and used * 4 <= self.max_memory:
+            self.memory_interval = min(self.memory_interval * 2, MEMORY_CHECK_MAX_STEPS)
+        else:
+            # Quadrupling every step, the variables need log4(cap / used) steps to reach the cap
+            self.memory_interval = max(1, int(math.log2(self.max_memory / max(used, 1))) // 2)
+        self.last_memory = used
+        self.next_memory_check = self.steps + self.memory_interval
+        self.next_memory_time = time.monotonic() + MEMORY_CHECK_SECONDS
@@ -0,0 +1,335 @@
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from io import StringIO
+
+from lexical_analyzer import tokenize_lolcode
+from syntax_analyzer import LOLCODESyntaxAnalyzer
+from semantics_analyzer import ASTInterpreter, SemanticAnalyzer
+from input_providers import QueueInputProvider
+from output_sinks import StreamOutputSink
+
+TESTCASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'project-testcases')
+# Timings only compare within one machine, so the baseline is recorded locally and not committed
+BASELINE_PATH = os.path.join(TESTCASE_DIR, 'timing_baseline.json')
+BASELINE_FORMAT = 2
+PHASES = ('lex', 'parse', 'semantic', 'execute')
+
+# Iterations of the fixed pure-Python workload that calibrate() times
+CALIBRATION_SIZE = 50000
+
+# Phase times below this many milliseconds are too small to call a slowdown
+MIN_SLOWDOWN_MS = 0.5
+
+def run_case(source_code, input_lines):
+    """
+    Run a program once, feeding GIMMEH from `input_lines`.
+    Returns (stdout text, error text or None, {phase: seconds}).
+    """
+    timings = {}
+    output = StringIO()
+    sink = StreamOutputSink(output)
+    error = None
+
+    start = time.perf_counter()
+    try:
+        tokens = tokenize_lolcode(source_code)
+        timings['lex'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        syntax_analyzer = LOLCODESyntaxAnalyzer(tokens)
+        ast = syntax_analyzer.parse_program()
+        timings['parse'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        semantic_analyzer = SemanticAnalyzer(ast, syntax_analyzer.symbol_table)
+        if not semantic_analyzer.analyze():
+            raise ValueError("; ".join(semantic_analyzer.errors))
+        timings['semantic'] = time.perf_counter() - start
+
+        interpreter = ASTInterpreter(ast, syntax_analyzer.symbol_table,
+                                     input_provider=QueueInputProvider(input_lines), output=sink)
+        start = time.perf_counter()
+        interpreter.interpret(ast)
+        sink.flush()
+        timings['execute'] = time.perf_counter() - start
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    sink.flush()
+    return output.getvalue(), error, timings
+
+def load_cases(pattern=None):
+    """Every test case with an expected .out file, as (name, source, input lines, expected output)."""
+    cases = []
+    for path in sorted(glob.glob(os.path.join(TESTCASE_DIR, pattern or '*.lol'))):
+        stem, extension = os.path.splitext(path)
+        # A pattern such as '01*' also matches the .in and .out files
+        if extension != '.lol' or not os.path.isfile(stem + '.out'):
+            continue
+        with open(path) as file:
+            source_code = file.read()
+        with open(stem + '.out') as file:
+            expected = file.read()
+        input_lines = []
+        if os.path.isfile(stem + '.in'):
+            with open(stem + '.in') as file:
+                input_lines = file.read().splitlines()
+        cases.append((os.path.basename(stem), source_code, input_lines, expected))
+    return cases
+
+def time_case(source_code, input_lines, repeat):
+    """Median seconds per phase over `repeat` runs."""
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(repeat):
+        _, _, timings = run_case(source_code, input_lines)
+        for phase, seconds in timings.items():
+            samples[phase].append(seconds)
+    return {phase: statistics.median(values) for phase, values in samples.items() if values}
+
+def calibrate(repeat=5):
+    """
+    Median seconds for a fixed pure-Python workload that uses none of the code
+    under test. The baseline stores phase times as multiples of it, so a machine
+    that is busier or slower overall doesn't read as a slowdown.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        counts = {}
+        for i in range(CALIBRATION_SIZE):
+            word = str(i % 97)
+            counts[word] = counts.get(word, 0) + len(word)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def load_baseline(path):
+    """{case: {phase: time in calibration units}} from `path`; empty if missing or outdated."""
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as file:
+        data = json.load(file)
+    if data.get("format") != BASELINE_FORMAT:
+        print(f"ignoring {os.path.relpath(path)}: old format, run with --update-baseline to record a new one")
+        return {}
+    return data["cases"]
+
+def find_slowdowns(timings, baseline, threshold):
+    """Phases slower than the baseline by more than `threshold` (a fraction)."""
+    slowdowns = []
+    for phase, seconds in timings.items():
+        before = baseline.get(phase)
+        if before is None:
+            continue
+        if seconds > before * (1 + threshold) and (seconds - before) * 1000 > MIN_SLOWDOWN_MS:
+            slowdowns.append((phase, before, seconds))
+    return slowdowns
+
+# Seconds a check's CLI run may take before it counts as hung
+CLI_TIMEOUT = 60
+
+def run_cli(source_code, *cli_args):
+    """Run lolcode_cli.py on `source_code` in a fresh process. Returns (exit status, stdout, stderr)."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'program.lol')
+        with open(path, 'w') as file:
+            file.write(source_code)
+        cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lolcode_cli.py')
+        result = subprocess.run([sys.executable, cli, path, *cli_args], stdin=subprocess.DEVNULL,
+                                capture_output=True, text=True, timeout=CLI_TIMEOUT)
+    return result.returncode, result.stdout, result.stderr
+
+def check_empty_program():
+    """A program with nothing between HAI and KTHXBYE runs and prints nothing."""
+    status, stdout, stderr = run_cli("HAI\nKTHXBYE\n")
+    if status != 0 or stdout or stderr:
+        return f"exit {status}, stdout {stdout!r}, stderr {stderr!r}"
+
+# Malformed programs, each with the start of the syntax error the CLI should report
+MALFORMED_PROGRAMS = [
+    ("HAI\nIM IN YR l", "Expected UPPIN or NERFIN, found EOF"),
+    ("HAI\nR 3\nKTHXBYE\n", "Expected a variable before R"),
+    ("HAI\nIS NOW A NUMBR\nKTHXBYE\n", "Expected a variable before IS NOW A"),
+    ("HAI\nVISIBLE 1\nOIC\nKTHXBYE\n", "Expected KTHXBYE, found OIC"),
+]
+
+def check_malformed_programs():
+    """Malformed programs exit with status 3 and a syntax error, not a traceback or a hang."""
+    for source_code, message in MALFORMED_PROGRAMS:
+        try:
+            status, _, stderr = run_cli(source_code)
+        except subprocess.TimeoutExpired:
+            return f"{source_code!r} did not finish"
+        if status != 3 or not stderr.startswith(f"Syntax Error: {message}"):
+            return f"{source_code!r}: exit {status}, stderr {stderr!r}"
+
+def profile_calls(statement):
+    """{profile row: calls} for `statement` run ten times in a loop under ProfilingInterpreter."""
+    from lolcode_profiler import ProfilingInterpreter
+
+    source_code = ("HAI\nWAZZUP\nI HAS A acc ITZ \"\"\nI HAS A i ITZ 0\nBUHBYE\n"
+                   f"IM IN YR l UPPIN YR i TIL BOTH SAEM i AN 10\n{statement}\nIM OUTTA YR l\nKTHXBYE\n")
+    syntax_analyzer = LOLCODESyntaxAnalyzer(tokenize_lolcode(source_code))
+    ast = syntax_analyzer.parse_program()
+    interpreter = ProfilingInterpreter(ast, syntax_analyzer.symbol_table, output=StreamOutputSink(StringIO()))
+    interpreter.interpret(ast)
+    return {row['node']: row['calls'] for row in interpreter.report_rows()}
+
+def check_profiled_smoosh_store():
+    """The profiler counts a SMOOSH whose result is stored, and the variables it reads."""
+    calls = profile_calls('acc R SMOOSH acc AN "piece" AN i')
+    plain = profile_calls('acc R "piece"')
+    variable_reads = calls.get('EXPRESSION', 0) - plain.get('EXPRESSION', 0)
+    if calls.get('OPERATION:SMOOSH') != 10 or variable_reads != 20:
+        return f"expected 10 SMOOSH calls reading 20 variables, got {calls.get('OPERATION:SMOOSH')} and {variable_reads}"
+
+# A memory cap far above what a program uses may slow it down by at most this fraction
+# more than a step limit, which takes the same per-step bookkeeping
+MEMORY_CAP_OVERHEAD = 0.25
+
+def check_memory_cap_overhead(repeat=5):
+    """A program with 2000 variables runs about as fast under a 1G memory cap as under a step limit."""
+    from execution_limits import ExecutionLimits
+
+    source_code = "\n".join(["HAI", "WAZZUP", *(f"I HAS A v{i} ITZ {i}" for i in range(2000)),
+                             "I HAS A i ITZ 0", "BUHBYE",
+                             "IM IN YR l UPPIN YR i TIL BOTH SAEM i AN 20000",
+                             "  v1 R SUM OF v1 AN v2", "IM OUTTA YR l", "KTHXBYE", ""])
+
+    def run(limits):
+        # Each run starts from freshly declared variables
+        syntax_analyzer = LOLCODESyntaxAnalyzer(tokenize_lolcode(source_code))
+        ast = syntax_analyzer.parse_program()
+        interpreter = ASTInterpreter(ast, syntax_analyzer.symbol_table, output=StreamOutputSink(StringIO()),
+                                     limits=limits)
+        start = time.perf_counter()
+        interpreter.interpret(ast)
+        return time.perf_counter() - start
+
+    # Alternated, so a busy moment on the machine slows both
+    step_limited, capped = [], []
+    for _ in range(repeat):
+        step_limited.append(run(ExecutionLimits(max_steps=10 ** 12)))
+        capped.append(run(ExecutionLimits(max_memory=1024 ** 3)))
+    if min(capped) > min(step_limited) * (1 + MEMORY_CAP_OVERHEAD):
+        return f"{min(capped) * 1000:.1f}ms with a 1G memory cap, {min(step_limited) * 1000:.1f}ms with a step limit"
+
+# Operators nested in each expression of check_deep_nesting()
+NESTING_DEPTH = 3000
+
+def check_deep_nesting():
+    """Expressions nested NESTING_DEPTH operators deep evaluate like shallow ones."""
+    depth = NESTING_DEPTH
+    source_code = "\n".join([
+        "HAI", "WAZZUP", "I HAS A x ITZ 0", "BUHBYE",
+        "x R " + "SUM OF 1 AN " * depth + "1", "VISIBLE x",
+        "VISIBLE " + "BOTH SAEM 1 AN " * depth + "1",
+        "VISIBLE " + "NOT " * depth + "WIN",
+        "VISIBLE " + "ALL OF WIN AN " * depth + "WIN" + " MKAY" * depth,
+        "VISIBLE " + 'SMOOSH "a" AN ' * depth + '"b"',
+        "KTHXBYE", ""])
+    expected = f"{depth + 1}\nFAIL\nWIN\nWIN\n{'a' * depth}b\n"
+    output, error, _ = run_case(source_code, [])
+    if error or output != expected:
+        return f"error {error}, output {output[:60]!r}"
+
+# Checks beyond the expected outputs, as (name, function, timed). Each function returns
+# None when it passes and what went wrong otherwise; timed checks are skipped by --no-timing
+CHECKS = [
+    ('empty_program', check_empty_program, False),
+    ('malformed_programs', check_malformed_programs, False),
+    ('profiled_smoosh_store', check_profiled_smoosh_store, False),
+    ('deep_nesting', check_deep_nesting, False),
+    ('memory_cap_overhead', check_memory_cap_overhead, True),
+]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Check every project test case against its expected output and time each phase "
+                    "against the stored baseline.")
+    parser.add_argument('-k', '--pattern', default=None, help="only run test cases matching this glob (e.g. '0[1-5]*.lol')")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case; the median is used (default: 5)")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="flag phases slower than the baseline by this fraction (default: 0.25)")
+    parser.add_argument('--strict-timing', action='store_true', help="fail when any phase is flagged as slower")
+    parser.add_argument('--no-timing', action='store_true', help="only check outputs")
+    parser.add_argument('--update-baseline', action='store_true', help="store this run's timings as the new baseline")
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help="timing baseline recorded on this machine (default: project-testcases/timing_baseline.json)")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    calibration = None
+    if not args.no_timing:
+        calibration = calibrate()
+        print(f"calibration {calibration * 1000:.3f}ms")
+        if not baseline and not args.update_baseline:
+            print("no timing baseline for this machine; run with --update-baseline to record one")
+
+    cases = load_cases(args.pattern)
+    failures = 0
+    slow_cases = 0
+    new_baseline = dict(baseline)
+    for name, source_code, input_lines, expected in cases:
+        output, error, _ = run_case(source_code, input_lines)
+        if error or output != expected:
+            failures += 1
+            print(f"FAIL  {name}")
+            if error:
+                print(f"      error: {error}")
+            if output != expected:
+                print(f"      expected: {expected!r}")
+                print(f"      got:      {output!r}")
+            continue
+
+        if args.no_timing:
+            print(f"ok    {name}")
+            continue
+
+        timings = time_case(source_code, input_lines, args.repeat)
+        new_baseline[name] = {phase: seconds / calibration for phase, seconds in timings.items()}
+        phases = "  ".join(f"{phase} {timings[phase] * 1000:.3f}ms" for phase in PHASES)
+        # The baseline at this machine's current speed
+        expected = {phase: units * calibration for phase, units in baseline.get(name, {}).items()}
+        slowdowns = find_slowdowns(timings, expected, args.threshold)
+        if slowdowns:
+            slow_cases += 1
+            print(f"SLOW  {name}  {phases}")
+            for phase, before, after in slowdowns:
+                print(f"      {phase}: {before * 1000:.3f}ms -> {after * 1000:.3f}ms (+{(after / before - 1) * 100:.0f}%)")
+        else:
+            print(f"ok    {name}  {phases}")
+
+    print(f"{len(cases)} cases, {failures} failed, {slow_cases} slower than baseline")
+
+    # Checks only run with the whole suite, not for a -k selection of cases
+    if args.pattern is None:
+        checks = [(name, check) for name, check, timed in CHECKS if not (timed and args.no_timing)]
+        check_failures = 0
+        for name, check in checks:
+            problem = check()
+            if problem:
+                check_failures += 1
+                print(f"FAIL  check {name}: {problem}")
+            else:
+                print(f"ok    check {name}")
+        print(f"{len(checks)} checks, {check_failures} failed")
+        failures += check_failures
+
+    if args.update_baseline and not args.no_timing:
+        with open(args.baseline, 'w') as file:
+            json.dump({"format": BASELINE_FORMAT, "cases": new_baseline}, file, indent=2, sort_keys=True)
+            file.write('\n')
+        print(f"baseline written to {os.path.relpath(args.baseline)}")
+
+    if failures or (args.strict_timing and slow_cases):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
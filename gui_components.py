@@ -0,0 +1,265 @@
+from array import array
+from bisect import bisect_left
+
+# Default number of lines the console keeps before trimming the oldest ones
+CONSOLE_SCROLLBACK = 10000
+# Milliseconds between console inserts while output is arriving
+CONSOLE_FLUSH_MS = 50
+
+class ConsoleSink:
+    """
+    Collects program output for a Tk Text widget. Text is inserted in one batch
+    every `flush_ms` milliseconds, and only the last `max_lines` lines are kept,
+    both in the widget and in the pending batch, so memory stays flat however much
+    a program prints. When `log_path` is set the full output is also written there.
+    """
+
+    def __init__(self, widget, scheduler, max_lines=CONSOLE_SCROLLBACK, flush_ms=CONSOLE_FLUSH_MS, log_path=None):
+        self.widget = widget
+        self.scheduler = scheduler  # Any Tk widget; used for after()
+        self.max_lines = max(1, max_lines)
+        self.flush_ms = flush_ms
+        self.log_path = log_path
+        self.log = None
+        self.pending = []
+        self.pending_lines = 0
+        self.flush_job = None
+
+    def reset(self):
+        """Clear the console for a new run and start a fresh log file."""
+        self.cancel()
+        self.pending = []
+        self.pending_lines = 0
+        self.widget.config(state='normal')
+        self.widget.delete('1.0', 'end')
+        self.widget.config(state='disabled')
+        self.close_log()
+        if self.log_path:
+            self.log = open(self.log_path, 'w')
+
+    def write(self, text):
+        if not text:
+            return
+        if self.log:
+            self.log.write(text)
+        self.pending.append(text)
+        self.pending_lines += text.count('\n')
+        if self.pending_lines > 2 * self.max_lines:
+            # Everything but the last max_lines lines would be trimmed on insert anyway
+            lines = "".join(self.pending).splitlines(True)[-self.max_lines:]
+            self.pending = ["".join(lines)]
+            self.pending_lines = len(lines)
+        if self.flush_job is None:
+            self.flush_job = self.scheduler.after(self.flush_ms, self.flush)
+
+    def flush(self):
+        """Insert everything pending in one go and trim the scrollback."""
+        self.flush_job = None
+        if not self.pending:
+            return
+        text = "".join(self.pending)
+        self.pending = []
+        self.pending_lines = 0
+
+        widget = self.widget
+        widget.config(state='normal')
+        widget.insert('end', text)
+        # The Text widget always ends with a newline of its own, hence the - 1
+        excess = int(widget.index('end-1c').split('.')[0]) - 1 - self.max_lines
+        if excess > 0:
+            widget.delete('1.0', f'{excess + 1}.0')
+        widget.see('end')
+        widget.config(state='disabled')
+
+    def cancel(self):
+        if self.flush_job is not None:
+            self.scheduler.after_cancel(self.flush_job)
+            self.flush_job = None
+
+    def close_log(self):
+        if self.log:
+            self.log.close()
+            self.log = None
+
+    def close(self):
+        """Show anything still pending and finish the log file."""
+        self.cancel()
+        self.flush()
+        self.close_log()
+
+# Fastest the Symbol Table panel redraws, in milliseconds (100 ms is 10 Hz)
+SYMBOL_REFRESH_MS = 100
+
+class SymbolTablePanel:
+    """
+    Keeps a Variable/Type/Value Treeview in step with symbol table snapshots.
+    Snapshots can arrive as often as they like; the view is refreshed at most once
+    every `refresh_ms` milliseconds from the latest one, and each refresh only
+    touches the rows of variables that were added, changed or dropped.
+    """
+
+    def __init__(self, tree, scheduler, refresh_ms=SYMBOL_REFRESH_MS):
+        self.tree = tree
+        self.scheduler = scheduler  # Any Tk widget; used for after()
+        self.refresh_ms = refresh_ms
+        self.rows = {}          # variable name -> (row id, (type, value)) as shown
+        self.latest = None      # newest snapshot not yet shown
+        self.refresh_job = None
+
+    def clear(self):
+        if self.refresh_job is not None:
+            self.scheduler.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        self.latest = None
+        self.rows = {}
+        self.tree.delete(*self.tree.get_children())
+
+    def update(self, variables):
+        """Queue a snapshot of {name: (type, value)} to be shown on the next refresh."""
+        self.latest = variables
+        if self.refresh_job is None:
+            self.refresh_job = self.scheduler.after(self.refresh_ms, self.refresh)
+
+    def refresh(self):
+        self.refresh_job = None
+        variables = self.latest
+        if variables is None:
+            return
+        self.latest = None
+
+        tree = self.tree
+        rows = self.rows
+        dropped = [name for name in rows if name not in variables]
+        if dropped:
+            tree.delete(*(rows.pop(name)[0] for name in dropped))
+        for name, details in variables.items():
+            row = rows.get(name)
+            if row is None:
+                rows[name] = (tree.insert('', 'end', values=(name, details[0], details[1])), details)
+            elif row[1] != details:
+                tree.item(row[0], values=(name, details[0], details[1]))
+                rows[name] = (row[0], details)
+
+    def flush(self):
+        """Show the latest snapshot now, e.g. when a run ends."""
+        if self.refresh_job is not None:
+            self.scheduler.after_cancel(self.refresh_job)
+        self.refresh()
+
+class VirtualTokenList:
+    """
+    Shows a token stream in a Treeview without creating a row per token. Tokens are
+    kept in compact arrays (line numbers, interned kinds, lexemes) and only enough
+    rows to fill the viewport exist; scrolling rewrites those rows in place, so
+    opening and scrolling through 100k+ tokens costs the same as a few dozen.
+    The Treeview is expected to have Line, Lexeme, Token and Classification columns.
+    """
+
+    def __init__(self, tree, scrollbar, classify=None, row_height=20):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.classify = classify or (lambda kind: 'Unknown')
+        self.row_height = row_height
+        self.lines = array('I')
+        self.kinds = array('H')
+        self.lexemes = []
+        self.kind_names = []            # interned token kinds
+        self.kind_classifications = []  # classification of each interned kind
+        self.top = 0                    # index of the first token shown
+        self.capacity = 1               # rows that fit in the viewport
+        self.row_ids = []
+
+        scrollbar.config(command=self.yview)
+        tree.bind('<Configure>', self.on_configure)
+        tree.bind('<MouseWheel>', self.on_mousewheel)
+        tree.bind('<Button-4>', lambda event: self.scroll(-3))
+        tree.bind('<Button-5>', lambda event: self.scroll(3))
+
+    def __len__(self):
+        return len(self.lexemes)
+
+    def set_tokens(self, tokens):
+        """Replace the stream with `tokens`, a list of (kind, lexeme, line) tuples."""
+        kind_index = {}
+        lines = array('I')
+        kinds = array('H')
+        lexemes = []
+        for kind, lexeme, line in tokens:
+            index = kind_index.get(kind)
+            if index is None:
+                index = kind_index[kind] = len(kind_index)
+            kinds.append(index)
+            # The lexer numbers a NEWLINE with the line it starts; show it on the line it ends
+            lines.append(line - 1 if kind == 'NEWLINE' else line)
+            lexemes.append(lexeme)
+        self.lines, self.kinds, self.lexemes = lines, kinds, lexemes
+        self.kind_names = list(kind_index)
+        self.kind_classifications = [self.classify(kind) for kind in self.kind_names]
+        self.top = 0
+        self.render()
+
+    def clear(self):
+        self.set_tokens([])
+
+    def row_values(self, index):
+        kind = self.kinds[index]
+        lexeme = self.lexemes[index]
+        return (self.lines[index], lexeme.encode('unicode_escape').decode() if lexeme.isspace() else lexeme,
+                self.kind_names[kind], self.kind_classifications[kind])
+
+    def render(self):
+        """Rewrite the visible rows from `top` and update the scrollbar."""
+        tree = self.tree
+        total = len(self.lexemes)
+        self.top = max(0, min(self.top, total - self.capacity))
+        shown = min(self.capacity, total - self.top)
+
+        while len(self.row_ids) < shown:
+            self.row_ids.append(tree.insert('', 'end'))
+        if len(self.row_ids) > shown:
+            tree.delete(*self.row_ids[shown:])
+            del self.row_ids[shown:]
+        for offset, row_id in enumerate(self.row_ids):
+            tree.item(row_id, values=self.row_values(self.top + offset))
+
+        if total:
+            self.scrollbar.set(self.top / total, (self.top + shown) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def on_configure(self, event):
+        # The heading takes about one row
+        capacity = max(1, event.height // self.row_height - 1)
+        if capacity != self.capacity:
+            self.capacity = capacity
+            self.render()
+
+    def on_mousewheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
+        return 'break'
+
+    def scroll(self, rows):
+        self.top += rows
+        self.render()
+        return 'break'
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units' | 'pages')."""
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self.lexemes))
+        elif args[0] == 'scroll':
+            step = self.capacity if args[2] == 'pages' else 1
+            self.top += int(args[1]) * step
+        self.render()
+
+    def jump_to_line(self, line):
+        """Scroll to the first token on `line` (or the next line that has one) and select it."""
+        index = bisect_left(self.lines, line)
+        if index >= len(self.lexemes):
+            return False
+        self.top = index
+        self.render()
+        row = index - self.top
+        if row < len(self.row_ids):
+            self.tree.selection_set(self.row_ids[row])
+        return True
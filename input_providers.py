@@ -0,0 +1,165 @@
+import io
+import os
+import stat
+from collections import deque
+
+def coerce_input(text):
+    """Convert GIMMEH input the way the interpreter always has: NUMBAR, NUMBR or YARN."""
+    try:
+        if '.' in text:
+            return float(text)
+        return int(text)
+    except ValueError:
+        return text  # Treat as string if conversion fails
+
+class InputProvider:
+    """
+    Source of GIMMEH values. read() returns (text, value), where value is the
+    text already coerced by coerce_input(), or None when there is no more input.
+    Subclasses implement fill(), which adds one or more raw lines with add_lines().
+    """
+
+    def __init__(self):
+        self.pending = deque()  # (text, value) pairs read ahead but not used yet
+
+    def add_lines(self, lines):
+        self.pending.extend((line, coerce_input(line)) for line in lines)
+
+    def fill(self, var_name):
+        """Read more input for `var_name`; returns False at end of input."""
+        return False
+
+    def skip(self, count):
+        """
+        Pass over the first `count` lines of a source that starts again from the
+        top on every run, as when resuming from a checkpoint. Other sources
+        have nothing to replay, so by default this does nothing.
+        """
+
+    def read(self, var_name):
+        if not self.pending and not self.fill(var_name):
+            return None
+        return self.pending.popleft() if self.pending else None
+
+class DialogInputProvider(InputProvider):
+    """Asks for each value with a Tkinter dialog."""
+
+    def __init__(self, master=None):
+        super().__init__()
+        self.master = master
+
+    def fill(self, var_name):
+        import tkinter.simpledialog
+        text = tkinter.simpledialog.askstring("Input", f"Enter value for {var_name}:", parent=self.master)
+        if text is None:
+            return False
+        self.pending.append((text, coerce_input(text)))
+        return True
+
+class StreamInputProvider(InputProvider):
+    """
+    One value per line from a text stream such as stdin. Regular files are read
+    `chunk_size` characters of lines at a time. Anything else (a terminal, or a
+    pipe from a program that answers each prompt) is read one line at a time,
+    so reading never waits for input nobody has asked for yet.
+    """
+
+    def __init__(self, stream, chunk_size=65536):
+        super().__init__()
+        self.stream = stream
+        self.chunk_size = chunk_size
+        try:
+            self.chunked = stat.S_ISREG(os.fstat(stream.fileno()).st_mode)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            self.chunked = False
+
+    def fill(self, var_name):
+        if self.chunked:
+            lines = self.stream.readlines(self.chunk_size)
+        else:
+            line = self.stream.readline()
+            lines = [line] if line else []
+        self.add_lines(line.rstrip('\r\n') for line in lines)
+        return bool(lines)
+
+    def skip(self, count):
+        for _ in range(count):
+            if not self.stream.readline():
+                break
+
+class FileInputProvider(InputProvider):
+    """Every value of a pre-recorded input file, one per line, read and coerced up front."""
+
+    def __init__(self, path):
+        super().__init__()
+        with open(path) as file:
+            self.add_lines(file.read().splitlines())
+
+class QueueInputProvider(InputProvider):
+    """
+    Values held in memory: `lines` to start with, plus anything added later with
+    put(). When they run out and a queue.Queue-like `source` is given, `request`
+    is called with the variable name and the provider waits on `source` for a line,
+    a list of lines, or None for end of input.
+    """
+
+    def __init__(self, lines=(), source=None, request=None):
+        super().__init__()
+        self.source = source
+        self.request = request
+        self.add_lines(lines)
+
+    def put(self, line):
+        self.add_lines([line])
+
+    def fill(self, var_name):
+        if self.source is None:
+            return False
+        if self.request:
+            self.request(var_name)
+        item = self.source.get()
+        if item is None:
+            return False
+        self.add_lines([item] if isinstance(item, str) else item)
+        return True
+
+class AsyncInputProvider(InputProvider):
+    """
+    InputProvider for AsyncInterpreter: read() and fill() are coroutines, so a
+    session waiting for input suspends instead of blocking its event loop.
+    """
+
+    async def fill(self, var_name):
+        return False
+
+    async def read(self, var_name):
+        if not self.pending and not await self.fill(var_name):
+            return None
+        return self.pending.popleft() if self.pending else None
+
+class AsyncQueueInputProvider(AsyncInputProvider):
+    """
+    QueueInputProvider for asyncio: when `lines` and put() run out, `request` is
+    called with the variable name and the session awaits `source`, an
+    asyncio.Queue, for a line, a list of lines, or None for end of input.
+    """
+
+    def __init__(self, lines=(), source=None, request=None):
+        super().__init__()
+        self.source = source
+        self.request = request
+        self.add_lines(lines)
+
+    def put(self, line):
+        self.add_lines([line])
+
+    async def fill(self, var_name):
+        if self.source is None:
+            return False
+        if self.request:
+            self.request(var_name)
+        item = await self.source.get()
+        if item is None:
+            return False
+        self.add_lines([item] if isinstance(item, str) else item)
+        return True
@@ -0,0 +1,81 @@
+import time
+
+from lexical_analyzer import tokenize_lolcode
+from syntax_analyzer import LOLCODESyntaxAnalyzer
+from semantics_analyzer import SemanticAnalyzer
+from lolcode_hooks import InterpreterHooks, prepare_interpreter
+from input_providers import QueueInputProvider
+from output_sinks import QueueOutputSink
+from yarn import flatten
+
+# Seconds between output flushes and between symbol table snapshots sent to the GUI
+OUTPUT_INTERVAL = 0.05
+SNAPSHOT_INTERVAL = 0.1
+# Buffered output is sent early once it grows past this many characters
+OUTPUT_CHUNK = 8192
+
+def snapshot(symbol_table):
+    """Variables as {name: (type, value)}, safe to send between processes."""
+    return {name: (cell.type, flatten(cell.value)) for name, cell in symbol_table.variables.items()}
+
+class SnapshotHooks(InterpreterHooks):
+    """Sends a symbol table snapshot at most every SNAPSHOT_INTERVAL seconds, and only when it changed."""
+
+    def __init__(self, messages, symbol_table, output):
+        self.messages = messages
+        self.symbol_table = symbol_table
+        self.output = output
+        self.last_snapshot = 0.0
+        self.last_variables = None
+
+    def on_statement(self, node):
+        now = time.monotonic()
+        if now - self.last_snapshot >= SNAPSHOT_INTERVAL:
+            self.last_snapshot = now
+            variables = snapshot(self.symbol_table)
+            if variables != self.last_variables:
+                self.last_variables = variables
+                self.output.flush()  # Keep output and snapshots in program order
+                self.messages.put(('symbols', variables))
+
+def run_program(source_code, messages, replies, input_lines=()):
+    """
+    Worker process entry point. Runs a program and reports back on `messages` with
+    ('output', text), ('symbols', {name: (type, value)}), ('input', var_name),
+    ('error', text) and finally ('done', None). GIMMEH uses `input_lines` first and
+    then waits on `replies` for a line, a list of lines, or None for no input.
+    """
+    output = QueueOutputSink(messages, buffer_size=OUTPUT_CHUNK, flush_interval=OUTPUT_INTERVAL)
+    symbol_table = None
+
+    def request_input(var_name):
+        output.flush()
+        messages.put(('input', var_name))
+
+    try:
+        tokens = tokenize_lolcode(source_code)
+        syntax_analyzer = LOLCODESyntaxAnalyzer(tokens)
+        ast = syntax_analyzer.parse_program()
+        symbol_table = syntax_analyzer.symbol_table
+
+        semantic_analyzer = SemanticAnalyzer(ast, symbol_table)
+        if not semantic_analyzer.analyze():
+            for error in semantic_analyzer.errors:
+                messages.put(('error', f"Semantic Error: {error}"))
+        else:
+            interpreter = prepare_interpreter(ast, symbol_table, hooks=SnapshotHooks(messages, symbol_table, output),
+                                              input_provider=QueueInputProvider(input_lines, replies, request_input),
+                                              output=output)
+            try:
+                interpreter.interpret(ast)
+            except Exception as e:
+                output.flush()
+                messages.put(('error', f"Runtime Error: {e}"))
+    except Exception as e:
+        output.flush()
+        messages.put(('error', f"Error: {e}"))
+    finally:
+        output.flush()
+        if symbol_table is not None:
+            messages.put(('symbols', snapshot(symbol_table)))
+        messages.put(('done', None))
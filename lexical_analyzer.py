@@ -1,11 +1,23 @@
 import re
 from LOLCODE_Token import LOLToken 
 
-# Compile patterns into a single regex
-token_patterns = []
-for name, pattern in LOLToken: 
-    token_patterns.append(f'(?P<{name}>{pattern})')
-token_regex = re.compile('|'.join(token_patterns), re.S)
+_token_regex = None
+
+def get_token_regex():
+    """Compile the token patterns into a single regex on first use."""
+    global _token_regex
+    if _token_regex is None:
+        token_patterns = []
+        for name, pattern in LOLToken: 
+            token_patterns.append(f'(?P<{name}>{pattern})')
+        _token_regex = re.compile('|'.join(token_patterns), re.S)
+    return _token_regex
+
+def __getattr__(name):
+    # Keep `lexical_analyzer.token_regex` working without compiling at import time
+    if name == 'token_regex':
+        return get_token_regex()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def tokenize_lolcode(source_code):
     tokens = []
@@ -14,7 +26,7 @@ def tokenize_lolcode(source_code):
     start_line = 0
     end_line = 0
     
-    for match in re.finditer(token_regex, source_code):
+    for match in get_token_regex().finditer(source_code):
         kind = match.lastgroup # Type of token
         value = match.group(kind) # Token
 
@@ -43,4 +55,4 @@ def tokenize_lolcode(source_code):
         # Check if a token is aligned with a multiline comment
         if (start_line <= token[2] <= end_line) and token[0] != 'NEWLINE':
             raise SyntaxError("Error: multiline comments should have its own line")
-    return tokens
\ No newline at end of file
+    return tokens
@@ -0,0 +1,302 @@
+import json
+import os
+
+from syntax_analyzer import NodeType, ASTNode, SymbolTable, ValueCell
+from semantics_analyzer import ASTInterpreter
+from yarn import flatten
+
+# Version of the checkpoint file layout
+CHECKPOINT_FORMAT = 2
+
+def save_scope(symbol_table, paths):
+    """A symbol table as JSON-ready data; function bodies are stored as AST paths."""
+    return {
+        "variables": {name: [cell.type, flatten(cell.value)] for name, cell in symbol_table.variables.items()},
+        "functions": {name: [function["params"], paths[id(function["body"])]]
+                      for name, function in symbol_table.functions.items()},
+        "loops": symbol_table.loops,
+    }
+
+def load_scope(data, root):
+    symbol_table = SymbolTable()
+    symbol_table.variables = {name: ValueCell(type, value) for name, (type, value) in data["variables"].items()}
+    for name, (params, body_path) in data["functions"].items():
+        symbol_table.add_function(name, params, node_at(root, body_path))
+    symbol_table.loops = data["loops"]
+    return symbol_table
+
+def node_paths(root: ASTNode):
+    """{id(node): [child indices from the root]} for every node in the tree."""
+    paths = {}
+    stack = [(root, [])]
+    while stack:
+        node, path = stack.pop()
+        paths[id(node)] = path
+        for index, child in enumerate(node.children):
+            stack.append((child, path + [index]))
+    return paths
+
+def node_at(root: ASTNode, path):
+    node = root
+    for index in path:
+        node = node.children[index]
+    return node
+
+def write_atomically(path, data):
+    """Write JSON to `path` so that readers only ever see the old or the new file."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as file:
+        json.dump(data, file, separators=(',', ':'))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+class CheckpointingInterpreter(ASTInterpreter):
+    """
+    ASTInterpreter whose whole execution state can be saved to a JSON file and
+    resumed from later: every scope in use, the stack of blocks, branches,
+    switch arms, loops (with their counters) and function calls being run, and
+    the GIMMEH input read ahead but not used yet.
+
+    Checkpoints are taken between statements, every `every` steps and whenever
+    request_checkpoint() has been called, e.g. from a signal handler. Steps are
+    counted by self.steps, which only goes up for loop iterations and function
+    calls; this is not the per-statement step count of ExecutionLimits. The
+    interpreter keeps its position on an explicit frame stack, which is what
+    the checkpoint stores; restore() loads one, and the next interpret() call
+    walks straight back down to the saved statement without re-running
+    anything before it. The control flow below mirrors ASTInterpreter's
+    helpers, with each construct able to pick up where a checkpoint left it.
+    """
+
+    def __init__(self, ast: ASTNode, symbol_table: SymbolTable, path, every=None, program_id=None, **kwargs):
+        super().__init__(ast, symbol_table, **kwargs)
+        self.path = path
+        self.every = every
+        self.program_id = program_id  # e.g. the source hash, checked on restore
+        self.paths = node_paths(ast)
+        self.frames = []        # [kind, node, state...] for every construct being run
+        self.resume = None      # saved frames still to walk back into
+        self.steps = 0
+        self.inputs_used = 0
+        self.requested = False
+        self.checkpoints_written = 0
+        self.next_checkpoint = every if every else float('inf')
+
+    def request_checkpoint(self):
+        """Take a checkpoint before the next statement. Safe to call from a signal handler."""
+        self.requested = True
+
+    def resumed(self, kind, node):
+        """The saved frame for `node` when walking back into a checkpoint, else None."""
+        if self.resume is None:
+            return None
+        frame = self.resume.pop(0)
+        if frame[0] != kind or frame[1] is not node:
+            raise ValueError("Checkpoint does not match this program.")
+        if not self.resume:
+            self.resume = None
+        return frame
+
+    def interpret(self, node: ASTNode):
+        node_type = node.node_type
+        if node_type == NodeType.PROGRAM or node_type == NodeType.STATEMENT_LIST:
+            self.run_block(node)
+        elif node_type == NodeType.IF_ELSE:
+            self.run_if(node)
+        elif node_type == NodeType.SWITCH_CASE:
+            self.run_switch(node)
+        elif node_type == NodeType.LOOP:
+            self.run_loop(node)
+        elif node_type == NodeType.FUNCTION_CALL:
+            self.run_call(node)
+        else:
+            ASTInterpreter.interpret(self, node)
+            if node_type == NodeType.INPUT:
+                self.inputs_used += 1
+
+    def run_block(self, node):
+        saved = self.resumed('block', node)
+        frame = ['block', node, saved[2] if saved else 0]
+        self.frames.append(frame)
+        try:
+            children = node.children
+            limits = self.limits
+            for index in range(frame[2], len(children)):
+                frame[2] = index
+                if self.steps >= self.next_checkpoint or self.requested:
+                    if self.resume is None:
+                        self.checkpoint()
+                if limits is not None and self.resume is None:
+                    limits.step(self.symbol_table)
+                self.interpret(children[index])
+        finally:
+            self.frames.pop()
+
+    def run_if(self, node):
+        saved = self.resumed('if', node)
+        statement_list_node = saved[2] if saved else self.select_if_branch(node)
+        if statement_list_node is None:
+            return
+        self.frames.append(['if', node, statement_list_node])
+        try:
+            self.interpret(statement_list_node)
+        finally:
+            self.frames.pop()
+
+    def run_switch(self, node):
+        saved = self.resumed('switch', node)
+        if saved:
+            frame = saved
+        else:
+            if not node.children or len(node.children) < 2:
+                raise ValueError("SWITCH_CASE must have an expression and at least one CASE_LIST.")
+            # [kind, node, switch value, index of the arm running, whether an arm has run]
+            frame = ['switch', node, self.evaluate_node(node.children[0]), 0, False]
+        self.frames.append(frame)
+        try:
+            children = node.children
+            if saved:
+                # Finish the arm the checkpoint was taken in
+                case_node = children[frame[3]]
+                if case_node.node_type == NodeType.DEFAULT_CASE:
+                    self.interpret(case_node.children[0])
+                    return
+                self.interpret(case_node.children[1])
+                if len(case_node.children) > 2 and case_node.children[2].value == 'BREAK':
+                    return
+            for index, statement_list_node in self.switch_arms(node, frame[2], frame[3], frame[4]):
+                frame[3] = index
+                frame[4] = True
+                self.interpret(statement_list_node)
+        finally:
+            self.frames.pop()
+
+    def run_loop(self, node):
+        saved = self.resumed('loop', node)
+        direction = node.children[0].value
+        loop_variable = node.children[1].value
+        condition_node = node.children[2]
+        statement_list_node = node.children[3]
+        # [kind, node, the loop's own counter]
+        frame = saved or ['loop', node, self.symbol_table.variables.get(loop_variable).value]
+        self.frames.append(frame)
+        try:
+            resuming = saved is not None
+            while True:
+                if not resuming:
+                    if self.evaluate_node(condition_node) != "WIN":
+                        break
+                    if self.limits is not None:
+                        self.limits.step(self.symbol_table)
+                    self.steps += 1
+                resuming = False
+                self.interpret(statement_list_node)
+
+                if direction == "UPPIN":
+                    frame[2] += 1
+                elif direction == "NERFIN":
+                    frame[2] -= 1
+                else:
+                    raise ValueError(f"Unknown loop direction: {direction}")
+                self.update_to_symbol_table(loop_variable, frame[2])
+        finally:
+            self.frames.pop()
+
+    def run_call(self, node):
+        saved = self.resumed('call', node)
+        if saved:
+            frame = saved
+        else:
+            body, local_scope = self.enter_function(node)
+            self.steps += 1
+            # [kind, node, the call's local scope, the function body]
+            frame = ['call', node, local_scope, body]
+        self.frames.append(frame)
+        try:
+            self.interpret(frame[3])
+        finally:
+            self.symbol_table = frame[2]
+            self.frames.pop()
+
+    def save_state(self):
+        """The execution state as JSON-ready data."""
+        paths = self.paths
+        scopes = []
+        scope_index = {}
+
+        def scope_ref(symbol_table):
+            # Scopes are often shared between frames, so each is stored once
+            index = scope_index.get(id(symbol_table))
+            if index is None:
+                index = scope_index[id(symbol_table)] = len(scopes)
+                scopes.append(save_scope(symbol_table, paths))
+            return index
+
+        frames = []
+        for frame in self.frames:
+            kind, node = frame[0], frame[1]
+            if kind == 'block':
+                frames.append([kind, paths[id(node)], frame[2]])
+            elif kind == 'if':
+                frames.append([kind, paths[id(node)], paths[id(frame[2])]])
+            elif kind == 'switch':
+                frames.append([kind, paths[id(node)], frame[2], frame[3], frame[4]])
+            elif kind == 'loop':
+                frames.append([kind, paths[id(node)], frame[2]])
+            else:
+                frames.append([kind, paths[id(node)], scope_ref(frame[2]), paths[id(frame[3])]])
+        return {
+            "format": CHECKPOINT_FORMAT,
+            "program": self.program_id,
+            "steps": self.steps,
+            "inputs_used": self.inputs_used,
+            "pending_input": [text for text, value in self.input_provider.pending],
+            "scope": scope_ref(self.symbol_table),
+            "scopes": scopes,
+            "frames": frames,
+        }
+
+    def checkpoint(self):
+        """Write a checkpoint of the current state to `path`; only called between statements."""
+        self.requested = False
+        if self.every:
+            self.next_checkpoint = self.steps + self.every
+        data = self.save_state()
+        # Output printed before the checkpoint must not be printed again on resume
+        self.output.flush()
+        write_atomically(self.path, data)
+        self.checkpoints_written += 1
+
+    def restore(self, data):
+        """Load a checkpoint written by save_state(); the next interpret(ast) resumes from it."""
+        if data.get("format") != CHECKPOINT_FORMAT:
+            raise ValueError(f"Unsupported checkpoint format: {data.get('format')}")
+        if self.program_id is not None and data.get("program") != self.program_id:
+            raise ValueError("Checkpoint was taken from a different program.")
+        root = self.ast
+        scopes = [load_scope(scope, root) for scope in data["scopes"]]
+        frames = []
+        for frame in data["frames"]:
+            kind, node = frame[0], node_at(root, frame[1])
+            if kind == 'if':
+                frames.append([kind, node, node_at(root, frame[2])])
+            elif kind == 'call':
+                frames.append([kind, node, scopes[frame[2]], node_at(root, frame[3])])
+            else:
+                frames.append([kind, node, *frame[2:]])
+        self.symbol_table = scopes[data["scope"]]
+        self.resume = frames or None
+        self.steps = data["steps"]
+        self.inputs_used = data["inputs_used"]
+        if self.every:
+            self.next_checkpoint = self.steps + self.every
+        # A stream such as stdin is read again from its start, past every line
+        # the checkpointed run had taken from it: those used and those read ahead
+        self.input_provider.skip(self.inputs_used + len(data["pending_input"]))
+        self.input_provider.pending.clear()
+        self.input_provider.add_lines(data["pending_input"])
+
+    def restore_file(self, path):
+        with open(path) as file:
+            self.restore(json.load(file))
@@ -0,0 +1,181 @@
+import argparse
+import hashlib
+import os
+import signal
+import sys
+
+from lexical_analyzer import tokenize_lolcode
+from syntax_analyzer import LOLCODESyntaxAnalyzer, write_ast
+from semantics_analyzer import SemanticAnalyzer
+from lolcode_hooks import TraceHooks, prepare_interpreter
+from input_providers import FileInputProvider, StreamInputProvider
+from output_sinks import BytesOutputSink, StreamOutputSink, DEFAULT_BUFFER_SIZE
+from execution_limits import ExecutionLimits, ResourceExhausted, parse_size
+
+# Exit statuses
+EXIT_OK = 0
+EXIT_RUNTIME_ERROR = 1
+EXIT_USAGE = 2
+EXIT_SYNTAX_ERROR = 3
+EXIT_SEMANTIC_ERROR = 4
+EXIT_RESOURCE_LIMIT = 5
+
+def run_file(path, dump_tokens=False, dump_ast=False, ast_depth=None, profile=False, profile_json=None,
+             line_profile=False, flamegraph=None, trace=False, input_path=None,
+             output_buffer=DEFAULT_BUFFER_SIZE, limits=None, checkpoint=None, checkpoint_every=None, resume=None):
+    """Lex, parse, analyze and execute one LOLCODE file. Returns an exit status."""
+    try:
+        with open(path, 'r') as file:
+            source_code = file.read()
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        tokens = tokenize_lolcode(source_code)
+        if dump_tokens:
+            for kind, lexeme, line in tokens:
+                sys.stderr.write(f"{line}\t{kind}\t{lexeme}\n")
+
+        syntax_analyzer = LOLCODESyntaxAnalyzer(tokens)
+        ast = syntax_analyzer.parse_program()
+        if dump_ast:
+            write_ast(ast, sys.stderr, max_depth=ast_depth)
+    except SyntaxError as e:
+        print(f"Syntax Error: {e}", file=sys.stderr)
+        return EXIT_SYNTAX_ERROR
+
+    semantic_analyzer = SemanticAnalyzer(ast, syntax_analyzer.symbol_table)
+    if not semantic_analyzer.analyze():
+        for error in semantic_analyzer.errors:
+            print(f"Semantic Error: {error}", file=sys.stderr)
+        return EXIT_SEMANTIC_ERROR
+
+    # GIMMEH reads one line per value, from the input file if given and stdin otherwise
+    try:
+        input_provider = FileInputProvider(input_path) if input_path else StreamInputProvider(sys.stdin)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    # VISIBLE output is encoded and written in chunks of output_buffer characters;
+    # a terminal, or an output_buffer of 0, gets every line as soon as it is printed
+    line_buffered = output_buffer <= 0 or sys.stdout.isatty()
+    if hasattr(sys.stdout, 'buffer'):
+        output = BytesOutputSink(sys.stdout.buffer, encoding=sys.stdout.encoding or 'utf-8',
+                                 buffer_size=output_buffer, line_buffered=line_buffered)
+    else:
+        output = StreamOutputSink(sys.stdout, buffer_size=output_buffer, line_buffered=line_buffered)
+
+    # Only profiled runs pay for the profiler, including its import
+    if line_profile or flamegraph:
+        from lolcode_profiler import LineProfilingInterpreter
+        interpreter = LineProfilingInterpreter(ast, syntax_analyzer.symbol_table, input_provider=input_provider, output=output,
+                                               limits=limits, source_name=os.path.basename(path),
+                                               source_lines=source_code.splitlines())
+    elif profile or profile_json:
+        from lolcode_profiler import ProfilingInterpreter
+        interpreter = ProfilingInterpreter(ast, syntax_analyzer.symbol_table, input_provider=input_provider,
+                                           output=output, limits=limits)
+    elif checkpoint or resume:
+        from lolcode_checkpoint import CheckpointingInterpreter
+        interpreter = CheckpointingInterpreter(ast, syntax_analyzer.symbol_table, checkpoint or resume,
+                                               every=checkpoint_every,
+                                               program_id=hashlib.sha256(source_code.encode('utf-8')).hexdigest(),
+                                               input_provider=input_provider, output=output, limits=limits)
+        if resume:
+            try:
+                interpreter.restore_file(resume)
+            except (OSError, ValueError, KeyError, IndexError) as e:
+                print(f"Error: can't resume from {resume}: {e}", file=sys.stderr)
+                return EXIT_USAGE
+        # `kill -USR1 <pid>` asks for a checkpoint before the next statement
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: interpreter.request_checkpoint())
+    else:
+        interpreter = prepare_interpreter(ast, syntax_analyzer.symbol_table, hooks=TraceHooks() if trace else None,
+                                          input_provider=input_provider, output=output, limits=limits)
+    status = EXIT_OK
+    try:
+        interpreter.interpret(ast)
+    except ResourceExhausted as e:
+        output.flush()
+        print(f"Resource Limit: {e}", file=sys.stderr)
+        status = EXIT_RESOURCE_LIMIT
+    except Exception as e:
+        output.flush()
+        print(f"Runtime Error: {e}", file=sys.stderr)
+        status = EXIT_RUNTIME_ERROR
+    finally:
+        output.flush()
+
+    if line_profile or flamegraph:
+        if line_profile:
+            interpreter.write_report(sys.stderr)
+        if flamegraph:
+            with open(flamegraph, 'w') as out:
+                interpreter.write_collapsed(out)
+    else:
+        if profile:
+            interpreter.write_report(sys.stderr)
+        if profile_json:
+            with open(profile_json, 'w') as out:
+                interpreter.write_json(out)
+    return status
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a LOLCODE program without the GUI. GIMMEH reads lines from stdin "
+                    "and VISIBLE writes to stdout.")
+    parser.add_argument('file', help="LOLCODE (.lol) source file")
+    parser.add_argument('--input', default=None, metavar='PATH', help="read GIMMEH values from PATH instead of stdin")
+    parser.add_argument('--output-buffer', type=int, default=DEFAULT_BUFFER_SIZE, metavar='N',
+                        help=f"characters of output buffered before writing; 0 writes every line "
+                             f"(default: {DEFAULT_BUFFER_SIZE}, or every line on a terminal)")
+    parser.add_argument('--tokens', action='store_true', help="write the token stream to stderr")
+    parser.add_argument('--ast', action='store_true', help="write the abstract syntax tree to stderr")
+    parser.add_argument('--ast-depth', type=int, default=None, metavar='N',
+                        help="only dump the AST down to depth N")
+    parser.add_argument('--profile', action='store_true',
+                        help="count and time every node type and operator, and write a report to stderr")
+    parser.add_argument('--profile-json', default=None, metavar='PATH', help="write the profile as JSON to PATH")
+    parser.add_argument('--line-profile', action='store_true',
+                        help="count hits and time for every source line, and write a report to stderr")
+    parser.add_argument('--flamegraph', default=None, metavar='PATH',
+                        help="write time per HOW IZ I call stack and line to PATH in collapsed-stack format")
+    parser.add_argument('--trace', action='store_true',
+                        help="write every statement, call, return, assignment and loop iteration to stderr")
+    parser.add_argument('--max-steps', type=int, default=None, metavar='N',
+                        help="stop after N steps: statements run, loop iterations and function calls")
+    parser.add_argument('--time-limit', type=float, default=None, metavar='SECONDS',
+                        help="stop once the program has run for SECONDS")
+    parser.add_argument('--max-memory', type=parse_size, default=None, metavar='SIZE',
+                        help="stop once variables hold more than SIZE bytes (e.g. 64M)")
+    parser.add_argument('--checkpoint', default=None, metavar='PATH',
+                        help="save the execution state to PATH on SIGUSR1 and every --checkpoint-every steps")
+    parser.add_argument('--checkpoint-every', type=int, default=None, metavar='N',
+                        help="checkpoint after every N loop iterations and function calls")
+    parser.add_argument('--resume', default=None, metavar='PATH',
+                        help="continue from a checkpoint of the same program (and keep checkpointing to it "
+                             "unless --checkpoint names another file)")
+    args = parser.parse_args(argv)
+    if (args.profile or args.profile_json) and (args.line_profile or args.flamegraph):
+        parser.error("--profile/--profile-json can't be combined with --line-profile/--flamegraph")
+    if args.trace and (args.profile or args.profile_json or args.line_profile or args.flamegraph):
+        parser.error("--trace can't be combined with profiling")
+    if (args.checkpoint or args.resume) and (args.trace or args.profile or args.profile_json
+                                             or args.line_profile or args.flamegraph):
+        parser.error("--checkpoint/--resume can't be combined with tracing or profiling")
+    if args.checkpoint_every is not None and not (args.checkpoint or args.resume):
+        parser.error("--checkpoint-every needs --checkpoint")
+    limits = None
+    if args.max_steps is not None or args.time_limit is not None or args.max_memory is not None:
+        limits = ExecutionLimits(args.max_steps, args.time_limit, args.max_memory)
+    return run_file(args.file, dump_tokens=args.tokens, dump_ast=args.ast, ast_depth=args.ast_depth,
+                    profile=args.profile, profile_json=args.profile_json,
+                    line_profile=args.line_profile, flamegraph=args.flamegraph, trace=args.trace,
+                    input_path=args.input, output_buffer=args.output_buffer, limits=limits,
+                    checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every, resume=args.resume)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import sys
+
+from syntax_analyzer import NodeType, ASTNode, SymbolTable
+from semantics_analyzer import ASTInterpreter
+from yarn import flatten
+
+# Statements that leave a new value in the variable named by node.value
+ASSIGNING_NODES = {NodeType.DECLARATION, NodeType.ASSIGNMENT, NodeType.INPUT}
+
+class InterpreterHooks:
+    """
+    Callbacks fired while a program runs. Subclass this and override the ones you
+    need; the defaults do nothing.
+    """
+
+    def on_statement(self, node):
+        """Called before every statement runs."""
+
+    def on_call(self, node, arguments):
+        """Called when a HOW IZ I body is entered, with the FUNCTION_CALL node and the argument values."""
+
+    def on_return(self, node, value):
+        """Called after a function call finishes, with the FUNCTION_CALL node and the value left in IT."""
+
+    def on_assign(self, node, name, value):
+        """Called after a declaration, assignment or GIMMEH stores `value` in `name`."""
+
+    def on_loop_iteration(self, node, counter):
+        """Called before each pass through a loop body, with the LOOP node and the loop variable's value."""
+
+class TraceHooks(InterpreterHooks):
+    """Writes one line per hook to `out` (stderr by default), e.g. for the CLI's --trace."""
+
+    def __init__(self, out=None):
+        self.out = out or sys.stderr
+
+    def on_statement(self, node):
+        self.out.write(f"{node.line}: {node.node_type.name}{' ' + str(node.value) if node.value is not None else ''}\n")
+
+    def on_call(self, node, arguments):
+        self.out.write(f"{node.line}: call {node.value}({', '.join(map(str, arguments))})\n")
+
+    def on_return(self, node, value):
+        self.out.write(f"{node.line}: return {node.value} -> {value}\n")
+
+    def on_assign(self, node, name, value):
+        self.out.write(f"{node.line}: {name} = {value!r}\n")
+
+    def on_loop_iteration(self, node, counter):
+        self.out.write(f"{node.line}: loop {node.value} {counter}\n")
+
+class HookedInterpreter(ASTInterpreter):
+    """
+    ASTInterpreter that reports statements, calls, returns, assignments and loop
+    iterations to an InterpreterHooks object. Loop and function bodies are found
+    once up front, so entering one is a single dictionary lookup.
+    """
+
+    def __init__(self, ast: ASTNode, symbol_table: SymbolTable, hooks: InterpreterHooks, **kwargs):
+        super().__init__(ast, symbol_table, **kwargs)
+        self.hooks = hooks
+        self._calls = []    # FUNCTION_CALL nodes currently running
+        self._bodies = {}   # id of a loop or function body -> its LOOP or FUNCTION_DEFINITION node
+        stack = [ast]
+        while stack:
+            node = stack.pop()
+            if node.node_type == NodeType.LOOP:
+                self._bodies[id(node.children[3])] = node
+            elif node.node_type == NodeType.FUNCTION_DEFINITION:
+                self._bodies[id(node.children[1])] = node
+            stack.extend(node.children)
+
+    def interpret(self, node: ASTNode):
+        owner = self._bodies.get(id(node))
+        if owner is not None:
+            variables = self.symbol_table.variables
+            if owner.node_type == NodeType.LOOP:
+                self.hooks.on_loop_iteration(owner, variables[owner.children[1].value].value)
+            elif self._calls:
+                # The interpreter has already bound the parameters in the local scope
+                params = owner.children[0].children
+                self.hooks.on_call(self._calls[-1], [flatten(variables[param.value].value) for param in params])
+            return ASTInterpreter.interpret(self, node)
+
+        node_type = node.node_type
+        if node_type == NodeType.PROGRAM or node_type == NodeType.STATEMENT_LIST:
+            return ASTInterpreter.interpret(self, node)
+
+        self.hooks.on_statement(node)
+        if node_type == NodeType.FUNCTION_CALL:
+            self._calls.append(node)
+            try:
+                ASTInterpreter.interpret(self, node)
+            finally:
+                self._calls.pop()
+            self.hooks.on_return(node, flatten(self.symbol_table.variables["IT"].value))
+            return
+
+        ASTInterpreter.interpret(self, node)
+        if node_type in ASSIGNING_NODES and (node.children or node_type == NodeType.INPUT):
+            self.hooks.on_assign(node, node.value, flatten(self.symbol_table.variables[node.value].value))
+
+def prepare_interpreter(ast: ASTNode, symbol_table: SymbolTable, hooks: InterpreterHooks = None, **kwargs):
+    """
+    Build the interpreter for a program. With no hooks this is the plain
+    ASTInterpreter, so unobserved runs pay nothing for the hook machinery.
+    Extra keyword arguments (master, input_provider, output, limits) go to the
+    interpreter.
+    """
+    if hooks is None:
+        return ASTInterpreter(ast, symbol_table, **kwargs)
+    return HookedInterpreter(ast, symbol_table, hooks, **kwargs)
@@ -0,0 +1,180 @@
+import json
+import sys
+from time import perf_counter
+
+from syntax_analyzer import NodeType
+from semantics_analyzer import ASTInterpreter
+
+# Node types whose value names the operator, so each operator gets its own row
+OPERATOR_NODES = {NodeType.OPERATION, NodeType.BOOLEAN_OPERATION, NodeType.COMPARISON,
+                  NodeType.UNARY_OP, NodeType.TYPECASTING, NodeType.RECASTING}
+
+class ProfilingInterpreter(ASTInterpreter):
+    """
+    ASTInterpreter that counts every node interpreted or evaluated (including the
+    evaluate_typed/smoosh_operand fast paths) per node type and operator and
+    records inclusive and exclusive time. It is only instantiated when
+    profiling is asked for, so ordinary runs keep the plain interpreter untouched.
+    """
+
+    # Nested operators go through evaluate_node() one at a time, so each gets its own
+    # row; profiled runs therefore use a Python frame per level of nesting
+    stacked_operators = frozenset()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = {}             # label -> [calls, inclusive seconds, exclusive seconds]
+        self._child_time = [0.0]    # time spent in callees, one entry per active call
+        self._active = {}           # label -> calls currently on the stack
+        self._counted = None        # node already being profiled by evaluate_typed/smoosh_operand
+
+    def _profile(self, method, node):
+        node_type = node.node_type
+        label = f"{node_type.name}:{node.value}" if node_type in OPERATOR_NODES else node_type.name
+        self._child_time.append(0.0)
+        self._active[label] = self._active.get(label, 0) + 1
+        start = perf_counter()
+        try:
+            return method(self, node)
+        finally:
+            elapsed = perf_counter() - start
+            callee_time = self._child_time.pop()
+            self._child_time[-1] += elapsed
+            self._active[label] -= 1
+
+            entry = self.stats.get(label)
+            if entry is None:
+                entry = self.stats[label] = [0, 0.0, 0.0]
+            entry[0] += 1
+            # Recursive calls of the same label are already inside the outer call's time
+            if not self._active[label]:
+                entry[1] += elapsed
+            entry[2] += elapsed - callee_time
+
+    def interpret(self, node):
+        return self._profile(ASTInterpreter.interpret, node)
+
+    def _profile_once(self, method, node):
+        # Stores and SMOOSH operands often skip evaluate_node(), e.g. for variable reads,
+        # cached literals and SMOOSH itself, so they are profiled here; when they do
+        # fall back to evaluate_node() for the same node, it isn't counted again
+        outer = self._counted
+        self._counted = node
+        try:
+            return self._profile(method, node)
+        finally:
+            self._counted = outer
+
+    def evaluate_node(self, node):
+        if node is self._counted:
+            self._counted = None
+            return ASTInterpreter.evaluate_node(self, node)
+        return self._profile(ASTInterpreter.evaluate_node, node)
+
+    def evaluate_typed(self, node):
+        return self._profile_once(ASTInterpreter.evaluate_typed, node)
+
+    def smoosh_operand(self, node):
+        return self._profile_once(ASTInterpreter.smoosh_operand, node)
+
+    def report_rows(self):
+        """Rows sorted by exclusive time, most expensive first."""
+        rows = [{'node': label, 'calls': calls, 'inclusive_ms': inclusive * 1000, 'exclusive_ms': exclusive * 1000}
+                for label, (calls, inclusive, exclusive) in self.stats.items()]
+        rows.sort(key=lambda row: row['exclusive_ms'], reverse=True)
+        return rows
+
+    def write_report(self, out=None):
+        """Write the profile as a table to `out` (stderr by default)."""
+        out = out or sys.stderr
+        rows = self.report_rows()
+        total = sum(row['exclusive_ms'] for row in rows) or 1.0
+        out.write(f"{'node':<28}{'calls':>10}{'incl ms':>12}{'excl ms':>12}{'excl %':>8}\n")
+        for row in rows:
+            out.write(f"{row['node']:<28}{row['calls']:>10}{row['inclusive_ms']:>12.3f}"
+                      f"{row['exclusive_ms']:>12.3f}{row['exclusive_ms'] / total * 100:>7.1f}%\n")
+
+    def write_json(self, out):
+        json.dump(self.report_rows(), out, indent=2)
+        out.write('\n')
+
+class LineProfilingInterpreter(ASTInterpreter):
+    """
+    ASTInterpreter that charges time to LOLCODE source lines instead of node types.
+    Each statement executed counts as a hit on its line, and the self time of every
+    line is also kept per HOW IZ I call stack, so it can be written out as collapsed
+    stacks ("main;f;g;prog.lol:12 <microseconds>") for flamegraph tools.
+    """
+
+    def __init__(self, *args, source_name='<program>', source_lines=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.source_name = source_name
+        self.source_lines = source_lines or []
+        self.line_stats = {}        # line -> [hits, seconds]
+        self.stack_stats = {}       # (call stack, line) -> seconds
+        self._stack = ('main',)     # HOW IZ I functions currently running
+        self._lines = [None]        # line of the innermost node being run
+        self._bodies = {}           # id of a function body -> function name
+        self._mark = perf_counter()
+
+    def _charge(self, now):
+        """Give the time since the last transition to the line that was running."""
+        line = self._lines[-1]
+        if line is not None:
+            elapsed = now - self._mark
+            self.line_stats[line][1] += elapsed
+            key = (self._stack, line)
+            self.stack_stats[key] = self.stack_stats.get(key, 0.0) + elapsed
+        self._mark = now
+
+    def _trace(self, method, node):
+        line = node.line
+        function_name = self._bodies.get(id(node))
+        # Nodes on the line that is already running need no bookkeeping
+        if function_name is None and (line is None or line == self._lines[-1]):
+            return method(self, node)
+
+        if line is not None and line not in self.line_stats:
+            self.line_stats[line] = [0, 0.0]
+        self._charge(perf_counter())
+        self._lines.append(line if line is not None else self._lines[-1])
+        caller_stack = self._stack
+        if function_name is not None:
+            self._stack = caller_stack + (function_name,)
+        try:
+            return method(self, node)
+        finally:
+            self._charge(perf_counter())
+            self._lines.pop()
+            self._stack = caller_stack
+
+    def interpret(self, node):
+        if node.line is not None and node.node_type not in (NodeType.PROGRAM, NodeType.STATEMENT_LIST):
+            entry = self.line_stats.get(node.line)
+            if entry is None:
+                entry = self.line_stats[node.line] = [0, 0.0]
+            entry[0] += 1
+        result = self._trace(ASTInterpreter.interpret, node)
+        if node.node_type == NodeType.FUNCTION_DEFINITION:
+            self._bodies[id(node.children[1])] = node.value
+        return result
+
+    def evaluate_node(self, node):
+        return self._trace(ASTInterpreter.evaluate_node, node)
+
+    def write_report(self, out=None):
+        """Write hits and self time per source line, in line order, to `out` (stderr by default)."""
+        out = out or sys.stderr
+        total = sum(seconds for _, seconds in self.line_stats.values()) or 1.0
+        out.write(f"{'line':>6}{'hits':>10}{'ms':>12}{'%':>8}  source\n")
+        for line in sorted(self.line_stats):
+            hits, seconds = self.line_stats[line]
+            source = self.source_lines[line - 1].strip() if 0 < line <= len(self.source_lines) else ''
+            out.write(f"{line:>6}{hits:>10}{seconds * 1000:>12.3f}{seconds / total * 100:>7.1f}%  {source}\n")
+
+    def write_collapsed(self, out):
+        """Write one "frame;frame;file:line microseconds" row per call stack and line."""
+        for (stack, line), seconds in sorted(self.stack_stats.items()):
+            microseconds = round(seconds * 1e6)
+            if microseconds:
+                out.write(f"{';'.join(stack)};{self.source_name}:{line} {microseconds}\n")
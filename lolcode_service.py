@@ -0,0 +1,378 @@
+import argparse
+import hashlib
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+from lexical_analyzer import tokenize_lolcode
+from syntax_analyzer import LOLCODESyntaxAnalyzer
+from semantics_analyzer import ASTInterpreter, SemanticAnalyzer
+from input_providers import QueueInputProvider
+from output_sinks import StreamOutputSink
+from execution_limits import ExecutionLimits, ResourceExhausted, parse_size
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Analyzed programs each worker keeps, least recently used dropped first
+CACHE_SIZE = 128
+# Seconds a run may take; the worker stops the program itself, and is killed and
+# replaced only if it still hasn't answered KILL_GRACE seconds later
+DEFAULT_TIMEOUT = 10.0
+KILL_GRACE = 2.0
+# Largest request body accepted, in bytes
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+def source_key(source_code):
+    return hashlib.sha256(source_code.encode('utf-8')).hexdigest()
+
+class ProgramCache:
+    """
+    LRU cache of analyzed programs, keyed by the SHA-256 of their source. An entry
+    is ('ok', ast, symbol_table) or (status, error messages) for programs that
+    failed to lex, parse or pass semantic analysis, so those are not redone either.
+    The AST is shared between runs (the interpreter only normalizes literals in it,
+    the same way every time); each run gets its own copy of the symbol table.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        self.max_entries = max(1, max_entries)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, source_code, timings):
+        """The entry for `source_code`, analyzing it on a miss. Returns (entry, hit)."""
+        key = source_key(source_code)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry, True
+        self.misses += 1
+        entry = analyze_program(source_code, timings)
+        self.entries[key] = entry
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry, False
+
+def analyze_program(source_code, timings):
+    """Lex, parse and check a program, recording phase times in `timings`."""
+    start = time.perf_counter()
+    try:
+        tokens = tokenize_lolcode(source_code)
+        timings['lex'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        syntax_analyzer = LOLCODESyntaxAnalyzer(tokens)
+        ast = syntax_analyzer.parse_program()
+        timings['parse'] = time.perf_counter() - start
+    except SyntaxError as e:
+        return ('syntax_error', [f"Syntax Error: {e}"])
+    except Exception as e:
+        return ('error', [f"Error: {e}"])
+
+    start = time.perf_counter()
+    semantic_analyzer = SemanticAnalyzer(ast, syntax_analyzer.symbol_table)
+    passed = semantic_analyzer.analyze()
+    timings['semantic'] = time.perf_counter() - start
+    if not passed:
+        return ('semantic_error', [f"Semantic Error: {error}" for error in semantic_analyzer.errors])
+    return ('ok', ast, syntax_analyzer.symbol_table.copy())
+
+def run_job(cache, source_code, input_lines, limits=None):
+    """Run one request in a worker. Returns the result dictionary sent back to the client."""
+    timings = {}
+    entry, cached = cache.get(source_code, timings)
+    output = StringIO()
+    errors = []
+    if entry[0] != 'ok':
+        status = entry[0]
+        errors = list(entry[1])
+    else:
+        _, ast, symbol_table = entry
+        sink = StreamOutputSink(output)
+        interpreter = ASTInterpreter(ast, symbol_table.copy(), input_provider=QueueInputProvider(input_lines),
+                                     output=sink, limits=limits)
+        status = 'ok'
+        start = time.perf_counter()
+        try:
+            interpreter.interpret(ast)
+        except ResourceExhausted as e:
+            status = 'timeout' if e.resource == 'time' else 'resource_limit'
+            errors.append(f"Resource Limit: {e}")
+        except Exception as e:
+            status = 'runtime_error'
+            errors.append(f"Runtime Error: {e}")
+        finally:
+            sink.flush()
+        timings['execute'] = time.perf_counter() - start
+    return {
+        'status': status,
+        'output': output.getvalue(),
+        'errors': errors,
+        'cached': cached,
+        'timing': {phase: round(seconds, 6) for phase, seconds in timings.items()},
+    }
+
+def worker_main(conn, cache_size):
+    """
+    Worker process loop. Everything the interpreter needs is imported before
+    'ready' is sent, so a request only pays for the run itself. Jobs arrive as
+    (source, input lines, (max steps, max seconds, max memory)); None stops the worker.
+    """
+    cache = ProgramCache(cache_size)
+    conn.send(('ready', os.getpid()))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        if job == 'stats':
+            conn.send({'cached_programs': len(cache.entries), 'hits': cache.hits, 'misses': cache.misses})
+            continue
+        source_code, input_lines, limits = job
+        try:
+            result = run_job(cache, source_code, input_lines, ExecutionLimits(*limits))
+        except Exception as e:
+            result = {'status': 'error', 'output': '', 'errors': [f"Error: {e}"], 'cached': False, 'timing': {}}
+        conn.send(result)
+
+class PoolWorker:
+    """One worker process and the pipe to it. `lock` is held while a job runs."""
+
+    def __init__(self, context, index, cache_size):
+        self.context = context
+        self.index = index
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.jobs = 0
+        self.restarts = 0
+        self.start()
+
+    def start(self):
+        self.conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(target=worker_main, args=(child_conn, self.cache_size), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self):
+        if not self.ready:
+            self.conn.recv()  # ('ready', pid)
+            self.ready = True
+
+    def restart(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        self.restarts += 1
+        self.start()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+class WorkerPool:
+    """
+    Pre-started worker processes, each with its own program cache. A program goes
+    to the worker picked by its source hash, so repeat runs find it analyzed
+    already; when that worker is busy an idle one takes the job instead, and only
+    when all are busy does the request wait for its own worker.
+    """
+
+    def __init__(self, size=None, cache_size=CACHE_SIZE):
+        import multiprocessing
+        context = multiprocessing.get_context('spawn')
+        self.workers = [PoolWorker(context, index, cache_size) for index in range(max(1, size or os.cpu_count() or 1))]
+        for worker in self.workers:
+            worker.wait_ready()
+
+    def acquire(self, source_code):
+        preferred = self.workers[int(source_key(source_code)[:8], 16) % len(self.workers)]
+        if preferred.lock.acquire(blocking=False):
+            return preferred
+        for worker in self.workers:
+            if worker.lock.acquire(blocking=False):
+                return worker
+        preferred.lock.acquire()
+        return preferred
+
+    def run(self, source_code, input_lines=(), timeout=DEFAULT_TIMEOUT, max_steps=None, max_memory=None):
+        """Run a program in a worker and return its result, with the worker and total time added."""
+        start = time.perf_counter()
+        worker = self.acquire(source_code)
+        try:
+            worker.wait_ready()
+            worker.jobs += 1
+            worker.conn.send((source_code, list(input_lines), (max_steps, timeout, max_memory)))
+            if worker.conn.poll(timeout + KILL_GRACE):
+                result = worker.conn.recv()
+            else:
+                worker.restart()
+                result = {'status': 'timeout', 'output': '', 'errors': [f"Error: timed out after {timeout} seconds"],
+                          'cached': False, 'timing': {}}
+        except (EOFError, OSError) as e:
+            worker.restart()
+            result = {'status': 'error', 'output': '', 'errors': [f"Error: worker failed: {e}"],
+                      'cached': False, 'timing': {}}
+        finally:
+            worker.lock.release()
+        result['worker'] = worker.index
+        result['timing']['total'] = round(time.perf_counter() - start, 6)
+        return result
+
+    def stats(self):
+        rows = []
+        for worker in self.workers:
+            row = {'worker': worker.index, 'pid': worker.process.pid, 'jobs': worker.jobs, 'restarts': worker.restarts}
+            # A busy worker's cache is left alone rather than waited for
+            if worker.lock.acquire(blocking=False):
+                try:
+                    worker.wait_ready()
+                    worker.conn.send('stats')
+                    row.update(worker.conn.recv())
+                finally:
+                    worker.lock.release()
+            rows.append(row)
+        return rows
+
+    def close(self):
+        for worker in self.workers:
+            with worker.lock:
+                worker.stop()
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    POST /run with a JSON body {"source": ..., "input": [lines] or "text", "timeout": seconds,
+    "max_steps": n, "max_memory": bytes or "64M"} (all but source optional) returns {"status", "output", "errors", "cached", "worker", "timing"}.
+    GET /health and GET /stats report on the service.
+    """
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self.send_json(200, {'workers': self.server.pool.stats()})
+        else:
+            self.send_json(404, {'error': f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/run':
+            self.send_json(404, {'error': f"unknown path {self.path}"})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_REQUEST_BYTES:
+            self.send_json(413, {'error': f"request larger than {MAX_REQUEST_BYTES} bytes"})
+            return
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+            source_code = request['source']
+            input_lines = request.get('input') or []
+            if isinstance(input_lines, str):
+                input_lines = input_lines.splitlines()
+            timeout = float(request.get('timeout') or self.server.default_timeout)
+            max_steps = request.get('max_steps', self.server.max_steps)
+            max_steps = None if max_steps is None else int(max_steps)
+            max_memory = request.get('max_memory', self.server.max_memory)
+            max_memory = None if max_memory is None else parse_size(max_memory)
+            if not isinstance(source_code, str) or not all(isinstance(line, str) for line in input_lines):
+                raise ValueError("source and input must be text")
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {'error': f"bad request: {e}"})
+            return
+        self.send_json(200, self.server.pool.run(source_code, input_lines, timeout, max_steps, max_memory))
+
+    def send_json(self, code, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return str(self.client_address[0]) if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def make_server(pool, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None, timeout=DEFAULT_TIMEOUT,
+                max_steps=None, max_memory=None, verbose=False):
+    """
+    An HTTP server on host:port, or on the Unix socket `unix_path`, that runs jobs
+    on `pool`. The limits are defaults for requests that don't set their own.
+    """
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        server = UnixHTTPServer(unix_path, ServiceHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.pool = pool
+    server.default_timeout = timeout
+    server.max_steps = max_steps
+    server.max_memory = max_memory
+    server.verbose = verbose
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve LOLCODE runs over local HTTP from a pool of pre-started worker processes.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--unix', default=None, metavar='PATH', help="listen on this Unix socket instead of TCP")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE,
+                        help=f"analyzed programs each worker keeps (default: {CACHE_SIZE})")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f"default seconds before a run is killed (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument('--max-steps', type=int, default=None, metavar='N',
+                        help="default limit on steps (statements run, loop iterations and function calls) per run")
+    parser.add_argument('--max-memory', type=parse_size, default=None, metavar='SIZE',
+                        help="default limit on bytes held in variables per run (e.g. 64M)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="log every request to stderr")
+    args = parser.parse_args(argv)
+
+    pool = WorkerPool(args.workers, args.cache_size)
+    try:
+        server = make_server(pool, args.host, args.port, args.unix, args.timeout, args.max_steps, args.max_memory,
+                             args.verbose)
+    except OSError as e:
+        pool.close()
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    where = args.unix or f"http://{args.host}:{server.server_address[1]}"
+    print(f"Serving LOLCODE on {where} with {len(pool.workers)} workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import sys
+import time
+
+# Characters buffered before a sink passes its output on
+DEFAULT_BUFFER_SIZE = 65536
+
+class OutputSink:
+    """
+    Where VISIBLE output (and the GIMMEH echo) goes. Text is collected and handed
+    to emit() in chunks once `buffer_size` characters are pending (a buffer_size of
+    0 passes every write straight on), and, when `flush_interval` is given, also
+    whenever that many seconds have passed since the last flush. `line_buffered`
+    flushes the target as well after every write, for terminals. Whoever runs the
+    interpreter calls flush() when the program ends, which also flushes the target.
+    """
+
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE, line_buffered=False, flush_interval=None):
+        self.buffer_size = buffer_size
+        self.line_buffered = line_buffered
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.size = 0
+        self.last_flush = time.monotonic()
+
+    def write(self, text):
+        self.buffer.append(text)
+        self.size += len(text)
+        if self.line_buffered:
+            self.flush()
+        elif self.size >= self.buffer_size or (
+                self.flush_interval is not None and time.monotonic() - self.last_flush >= self.flush_interval):
+            self.drain()
+
+    def drain(self):
+        """Hand everything pending to emit()."""
+        if self.buffer:
+            text = "".join(self.buffer)
+            self.buffer = []
+            self.size = 0
+            self.emit(text)
+        if self.flush_interval is not None:
+            self.last_flush = time.monotonic()
+
+    def flush(self):
+        self.drain()
+        self.flush_target()
+
+    def emit(self, text):
+        raise NotImplementedError
+
+    def flush_target(self):
+        """Flush whatever emit() writes to, if it buffers too."""
+
+class StreamOutputSink(OutputSink):
+    """Writes to a text stream; with no stream, to whatever sys.stdout is at the time."""
+
+    def __init__(self, stream=None, **kwargs):
+        super().__init__(**kwargs)
+        self.stream = stream
+
+    def emit(self, text):
+        (self.stream or sys.stdout).write(text)
+
+    def flush_target(self):
+        (self.stream or sys.stdout).flush()
+
+class BytesOutputSink(OutputSink):
+    """Encodes output once per chunk and writes it to a binary stream such as sys.stdout.buffer."""
+
+    def __init__(self, stream, encoding='utf-8', **kwargs):
+        super().__init__(**kwargs)
+        self.stream = stream
+        self.encoding = encoding
+
+    def emit(self, text):
+        self.stream.write(text.encode(self.encoding, 'replace'))
+
+    def flush_target(self):
+        self.stream.flush()
+
+class QueueOutputSink(OutputSink):
+    """Puts (kind, text) messages on a queue (queue, multiprocessing or asyncio), e.g. for the GUI worker process."""
+
+    def __init__(self, queue, kind='output', **kwargs):
+        super().__init__(**kwargs)
+        self.queue = queue
+        self.kind = kind
+
+    def emit(self, text):
+        self.queue.put_nowait((self.kind, text))
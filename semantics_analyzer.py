@@ -1,23 +1,81 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk, simpledialog
-import re
-import sys
-import copy
-from io import StringIO
-
 # Import the existing syntax analyzer components
-from syntax_analyzer import LOLCODESyntaxAnalyzer, NodeType, ASTNode, SymbolTable
+from syntax_analyzer import LOLCODESyntaxAnalyzer, NodeType, ASTNode, SymbolTable, write_ast
 from lexical_analyzer import tokenize_lolcode
 from token_classification import LEXEME_CLASSIFICATIONS
+from input_providers import InputProvider, DialogInputProvider
+from output_sinks import OutputSink, StreamOutputSink
+from yarn import Yarn, smoosh, flatten
+from gui_components import ConsoleSink, SymbolTablePanel, VirtualTokenList, CONSOLE_SCROLLBACK
+
+# Tkinter is only needed by the GUI and the GIMMEH dialog, so it is imported
+# on first use by load_tk()
+tk = filedialog = messagebox = ttk = simpledialog = None
+
+def load_tk():
+    """Import the Tkinter modules used by the GUI into this module."""
+    global tk, filedialog, messagebox, ttk, simpledialog
+    if tk is None:
+        import tkinter
+        import tkinter.filedialog
+        import tkinter.messagebox
+        import tkinter.simpledialog
+        import tkinter.ttk
+        tk = tkinter
+        filedialog = tkinter.filedialog
+        messagebox = tkinter.messagebox
+        simpledialog = tkinter.simpledialog
+        ttk = tkinter.ttk
+
+def value_type(value):
+    """The LOLCODE type of an evaluated value."""
+    if isinstance(value, float):
+        return 'NUMBAR'
+    elif isinstance(value, int):
+        return 'NUMBR'
+    elif isinstance(value, str):
+        if value == 'WIN' or value == 'FAIL':
+            return 'TROOF'
+        return 'YARN'
+    elif isinstance(value, Yarn):
+        return 'YARN'  # Never WIN or FAIL, it's too long
+    return 'NOOB'
+
+# Node types whose value apply_operator() works out from their operands' values
+OPERATOR_NODE_TYPES = frozenset({NodeType.OPERATION, NodeType.COMPARISON, NodeType.BOOLEAN_OPERATION,
+                                 NodeType.UNARY_OP, NodeType.TYPECASTING})
+
+# Variadic boolean operators stop at the first operand that is (True) or isn't (False) WIN
+SHORT_CIRCUIT = {'ALL': False, 'ANY': True}
+
+# Looking up NodeType.X costs far more than a global, and every operator evaluated compares against these
+_LITERAL, _EXPRESSION = NodeType.LITERAL, NodeType.EXPRESSION
+_OPERATION, _COMPARISON, _BOOLEAN_OPERATION = NodeType.OPERATION, NodeType.COMPARISON, NodeType.BOOLEAN_OPERATION
+_UNARY_OP, _TYPECASTING = NodeType.UNARY_OP, NodeType.TYPECASTING
 
 class ASTInterpreter:
-    def __init__(self, ast: ASTNode, symbol_table: SymbolTable, master = None):
+    # Operators that evaluate_operator() opens on its own stack when nested in another
+    stacked_operators = OPERATOR_NODE_TYPES
+
+    def __init__(self, ast: ASTNode, symbol_table: SymbolTable, master = None, input_provider: InputProvider = None,
+                 output: OutputSink = None, limits=None):
         self.ast = ast
         self.symbol_table = symbol_table
         self.master = master
+        # Where GIMMEH gets its values; a Tkinter dialog unless told otherwise
+        self.input_provider = input_provider or DialogInputProvider(master)
+        # Where VISIBLE writes; by default straight through to sys.stdout, like print()
+        self.output = output or StreamOutputSink(buffer_size=0)
+        # Step, time and memory budgets (an execution_limits.ExecutionLimits); None runs unbounded
+        self.limits = limits
+        if limits is not None:
+            limits.start()
+        # SWITCH_CASE node -> its jump table, or None when a case value isn't a literal
+        self.switch_tables = {}
+        # LITERAL node -> its (type, value), worked out on first use
+        self.literals = {}
 
     def evaluate_node(self, node: ASTNode):
-        """Recursively evaluate an AST node."""
+        """Evaluate an AST node."""
         if node.node_type == NodeType.LITERAL:
             if isinstance(node.value, str):
                 node.value = node.value.replace('"', '')
@@ -31,37 +89,82 @@ class ASTInterpreter:
         elif node.node_type == NodeType.EXPRESSION:
             if node.children:
                 return self.evaluate_node(node.children[0])  # Evaluate the child node
-            elif node.children == []: # Handle explicit variable
+            elif not node.children: # Handle explicit variable
                 var_details = self.symbol_table.variables.get(node.value)
                 if var_details:
-                    return var_details['value']
+                    value = var_details.value
+                    # Long SMOOSH results are only joined into a str when read
+                    return str(value) if value.__class__ is Yarn else value
                 else:
                     raise ValueError(f"Variable '{node.value}' not defined.")
             else:
                 raise IndexError(f"Expression {node} {node.children} has no children.")
-        elif node.node_type == NodeType.COMPARISON:
+        elif (node.node_type is _OPERATION or node.node_type is _COMPARISON or node.node_type is _BOOLEAN_OPERATION
+              or node.node_type is _UNARY_OP or node.node_type is _TYPECASTING):
+            return self.evaluate_operator(node)
+        else:
+            raise ValueError(f"Unknown node type: {node.node_type}")
+
+    def evaluate_operator(self, node: ASTNode):
+        """
+        Evaluate an operator node and the operators nested in it using an explicit
+        stack of open operators, so nesting depth costs list entries rather than
+        Python frames. Other operands go through evaluate_node(), or smoosh_operand()
+        for SMOOSH, and apply_operator() combines each operator's values.
+        """
+        stacked = self.stacked_operators
+        pending = []  # Enclosing operators as (node, operand values, operands left, SHORT_CIRCUIT entry, SMOOSH or not)
+        operator = node
+        while True:
+            # Too few operands is reported before any of them is evaluated
+            node_type = operator.node_type
+            if len(operator.children) < 2 and (node_type is _OPERATION or node_type is _COMPARISON):
+                raise IndexError(f"Operation node '{operator.value}' requires at least 2 operands.")
+            values = []
+            operands = iter(operator.children)
+            stop_on = SHORT_CIRCUIT.get(operator.value) if node_type is _BOOLEAN_OPERATION else None
+            smooshing = node_type is _OPERATION and operator.value == "SMOOSH"
+
+            while True:
+                nested = None
+                # ALL OF and ANY OF stop at the first operand that decides them
+                if stop_on is None or not values or (values[-1] == 'WIN') != stop_on:
+                    for child in operands:
+                        # Literals and variables are most operands; only test the rest against the set
+                        child_type = child.node_type
+                        if child_type is not _LITERAL and child_type is not _EXPRESSION and child_type in stacked:
+                            nested = child
+                            break
+                        values.append(self.smoosh_operand(child) if smooshing else self.evaluate_node(child))
+                        if stop_on is not None and (values[-1] == 'WIN') == stop_on:
+                            break
+                if nested is not None:
+                    pending.append((operator, values, operands, stop_on, smooshing))
+                    operator = nested
+                    break
+
+                # Every operand is in; hand the result to the enclosing operator
+                value = self.apply_operator(operator, values)
+                if not pending:
+                    return value
+                operator, values, operands, stop_on, smooshing = pending.pop()
+                values.append(value)
+
+    def apply_operator(self, node: ASTNode, values):
+        """Combine the evaluated operands of an operator node, in order, into its value."""
+        if node.node_type is _COMPARISON:
             if len(node.children) < 2:
                 raise IndexError(f"Operation node '{node.value}' requires at least 2 operands.")
-            # Handle specific operations
-            values = [self.evaluate_node(child) for child in node.children]
 
             if None in values:
                 raise ValueError(f"Operation '{node.value}' has NoneType operand(s): {values}")
-            
-            if any(isinstance(value, str) and (value == 'WIN' or value == 'FAIL') for value in values):
-                for i in range(len(values)):
-                    if values[i] == 'WIN':
-                        values[i] = 1
-                    elif values[i] == 'FAIL':
-                        values[i] = 0
-            
+
             operation = node.value
 
             if operation == "EQ":
                 if len(node.children) != 2:
                     raise ValueError("EQ operation must have exactly two operands.")
-                left = self.evaluate_node(node.children[0])
-                right = self.evaluate_node(node.children[1])
+                left, right = values
                 if left == right:
                     return 'WIN'
                 else:
@@ -70,14 +173,13 @@ class ASTInterpreter:
             if operation == "NEQ":
                 if len(node.children) != 2:
                     raise ValueError("NEQ operation must have exactly two operands.")
-                left = self.evaluate_node(node.children[0])
-                right = self.evaluate_node(node.children[1])
+                left, right = values
                 if left != right:
                     return 'WIN'
                 else:
                     return 'FAIL'
 
-        elif node.node_type == NodeType.BOOLEAN_OPERATION:
+        elif node.node_type is _BOOLEAN_OPERATION:
             if not node.children:
                 raise ValueError("BOOLEAN_OPERATION must have at least one child.")
 
@@ -86,8 +188,7 @@ class ASTInterpreter:
             if operation == "AND":
                 if len(node.children) != 2:
                     raise ValueError("AND must have exactly two operands.")
-                left = self.evaluate_node(node.children[0])
-                right = self.evaluate_node(node.children[1])
+                left, right = values
                 if left == 'WIN' and right == 'WIN':
                     return 'WIN'
                 else:
@@ -96,8 +197,7 @@ class ASTInterpreter:
             elif operation == "OR":
                 if len(node.children) != 2:
                     raise ValueError("OR must have exactly two operands.")
-                left = self.evaluate_node(node.children[0])
-                right = self.evaluate_node(node.children[1])
+                left, right = values
                 if left == 'WIN' or right == 'WIN':
                     return 'WIN'
                 else:
@@ -106,8 +206,7 @@ class ASTInterpreter:
             elif operation == "XOR":
                 if len(node.children) != 2:
                     raise ValueError("XOR must have exactly two operands.")
-                left = self.evaluate_node(node.children[0])
-                right = self.evaluate_node(node.children[1])
+                left, right = values
                 if left != right:
                     return 'WIN'
                 else:
@@ -116,20 +215,21 @@ class ASTInterpreter:
             elif operation == "NOT":
                 if len(node.children) != 1:
                     raise ValueError("NOT must have exactly one operand.")
-                operand = self.evaluate_node(node.children[0])
+                operand = values[0]
                 if operand == 'WIN':
                     return 'FAIL'
                 else:
                     return 'WIN'
 
+            # Only the operands up to the deciding one are evaluated
             elif operation == "ALL":
-                if all(self.evaluate_node(child) == 'WIN' for child in node.children):
+                if all(value == 'WIN' for value in values):
                     return 'WIN'
                 else:
                     return 'FAIL'
 
             elif operation == "ANY":
-                if any(self.evaluate_node(child) == 'WIN' for child in node.children):
+                if any(value == 'WIN' for value in values):
                     return 'WIN'
                 else:
                     return 'FAIL'
@@ -138,14 +238,12 @@ class ASTInterpreter:
                 raise ValueError(f"Unknown boolean operation: {operation}")
 
             
-        elif node.node_type == NodeType.UNARY_OP:
+        elif node.node_type is _UNARY_OP:
             if not node.children or len(node.children) != 1:
                 raise ValueError("Unary operation must have exactly one child node.")
 
-            operand_node = node.children[0]
-            
             if node.value == "NOT":
-                operand_result = self.evaluate_node(operand_node)
+                operand_result = values[0]
                 if operand_result == "FAIL":
                     return "WIN" 
                 else:
@@ -154,21 +252,17 @@ class ASTInterpreter:
             else:
                 raise ValueError(f"Unknown unary operation: {node.value}")
 
-        elif node.node_type == NodeType.OPERATION:
+        elif node.node_type is _OPERATION:
             if len(node.children) < 2:
                 raise IndexError(f"Operation node '{node.value}' requires at least 2 operands.")
-        
-            # Handle specific operations
-            values = [self.evaluate_node(child) for child in node.children]
-            # print(values)
+
             if None in values:
                 raise ValueError(f"Operation '{node.value}' has NoneType operand(s): {values}")
-            
+
             if node.value == "SMOOSH":
-                # Evaluate each child and convert their value to string, then concatenate
-                concatenated_string = "".join([str(self.evaluate_node(child)) for child in node.children])
-                return concatenated_string
-            
+                # Everything but a store expects a plain str
+                return flatten(smoosh(values))
+
             # no string value at this point
             if any(isinstance(value, str) and (value == 'WIN' or value == 'FAIL') for value in values):
                 for i in range(len(values)):
@@ -217,13 +311,12 @@ class ASTInterpreter:
                 if isinstance(value, float):
                     value = round(value, 2)
                 return value
-        elif node.node_type == NodeType.TYPECASTING:
+        elif node.node_type is _TYPECASTING:
             # Ensure there is a child to evaluate
             if not node.children or len(node.children) < 1:
                 raise ValueError("TYPECASTING node requires at least one child to evaluate.")
 
-            # Evaluate the child node
-            value = self.evaluate_node(node.children[0])
+            value = values[0]
 
             # Perform typecasting based on the target type defined in node.value
             if node.value == "NUMBR":  # Convert to integer
@@ -250,36 +343,278 @@ class ASTInterpreter:
                     return str(value)
             else:
                 raise ValueError(f"Unknown typecasting target '{node.value}'.")
-        else:
-            raise ValueError(f"Unknown node type: {node.node_type}")
 
-    def update_to_symbol_table(self, name, value):
-        if isinstance(value, float):
-            value = round(value, 2)
-            self.symbol_table.update_variable(name, 'NUMBAR', value)
-        elif isinstance(value, int):
-            self.symbol_table.update_variable(name, 'NUMBR', value)
-        elif isinstance(value, str):
-            if value == 'WIN' or value == 'FAIL':
-                self.symbol_table.update_variable(name, 'TROOF', value)
+    def evaluate_smoosh(self, node: ASTNode):
+        """
+        Evaluate a SMOOSH node, leaving a long result as a Yarn. Only stores keep
+        it that way, so a variable's Yarn can be appended to without a copy.
+        """
+        # Variables are read as stored, so a Yarn being built up is appended to, not copied
+        values = [self.smoosh_operand(child) for child in node.children]
+        if None in values:
+            raise ValueError(f"Operation '{node.value}' has NoneType operand(s): {values}")
+        return smoosh(values)
+
+    def smoosh_operand(self, node: ASTNode):
+        """Evaluate a SMOOSH operand, leaving a variable's Yarn unflattened."""
+        if node.node_type == NodeType.EXPRESSION and not node.children:
+            var_details = self.symbol_table.variables.get(node.value)
+            if var_details:
+                return var_details.value
+        return self.evaluate_node(node)
+
+    def evaluate_typed(self, node: ASTNode):
+        """
+        Evaluate a node to a (type, value) pair for storing. Variables come with
+        the type they were stored with, literals are typed once, and casts and
+        operators whose result type is fixed tag it directly, so a store never
+        works the type out from the value again.
+        """
+        node_type = node.node_type
+        if node_type == NodeType.EXPRESSION:
+            if not node.children:
+                cell = self.symbol_table.variables.get(node.value)
+                if cell is not None:
+                    # A Yarn is shared as is; appending to either copy leaves the other alone
+                    return cell.type, cell.value
             else:
-                self.symbol_table.update_variable(name, 'YARN', value)
-        else:
-            self.symbol_table.update_variable(name, 'NOOB', value)
+                return self.evaluate_typed(node.children[0])
+        elif node_type == NodeType.LITERAL:
+            typed = self.literals.get(node)
+            if typed is None:
+                value = self.evaluate_node(node)
+                typed = self.literals[node] = (value_type(value), value)
+            return typed
+        elif node_type == NodeType.TYPECASTING:
+            # evaluate_node() rejects any target but NUMBR, NUMBAR, YARN and TROOF
+            return node.value, self.evaluate_node(node)
+        elif node_type == NodeType.OPERATION:
+            if node.value == "SMOOSH" and len(node.children) >= 2:
+                value = self.evaluate_smoosh(node)
+                # Only a short plain str can spell WIN or FAIL
+                if value.__class__ is str and (value == 'WIN' or value == 'FAIL'):
+                    return 'TROOF', value
+                return 'YARN', value
+            value = self.evaluate_node(node)
+            value_class = value.__class__
+            if value_class is int:
+                return 'NUMBR', value
+            if value_class is float:
+                return 'NUMBAR', value
+            return value_type(value), value
+        elif node_type == NodeType.COMPARISON or node_type == NodeType.BOOLEAN_OPERATION or node_type == NodeType.UNARY_OP:
+            value = self.evaluate_node(node)
+            if value is None:
+                return 'NOOB', value
+            return 'TROOF', value
+        value = self.evaluate_node(node)
+        return value_type(value), value
+
+    def store_typed(self, name, type: str, value, declare=False):
+        """Store an already typed value in `name`, declaring it first if asked."""
+        if type == 'NUMBAR':
+            value = round(value, 2)
+        if declare:
+            self.symbol_table.add_variable(name, type, value)
+            return
+        cell = self.symbol_table.variables.get(name)
+        if cell is None or value is None:
+            # Unknown names raise, and None gets update_variable's default
+            self.symbol_table.update_variable(name, type, value)
+            return
+        cell.value = value
+        cell.type = type
+
+    def update_to_symbol_table(self, name, value):
+        self.store_typed(name, value_type(value), value)
 
     def add_to_symbol_table(self, name, value):
-        if isinstance(value, float):
-            value = round(value, 2)
-            self.symbol_table.add_variable(name, 'NUMBAR', value)
-        elif isinstance(value, int):
-            self.symbol_table.add_variable(name, 'NUMBR', value)
-        elif isinstance(value, str):
-            if value == 'WIN' or value == 'FAIL':
-                self.symbol_table.add_variable(name, 'TROOF', value)
+        self.store_typed(name, value_type(value), value, declare=True)
+
+    # The helpers below hold the control-flow rules themselves, so that an
+    # interpreter which runs statements differently (see async_interpreter)
+    # only decides how each chosen body is run.
+
+    def store_input(self, var_name, entry):
+        """Echo and store one (text, value) pair read for GIMMEH."""
+        if entry is None:
+            raise ValueError("No input provided by the user.")
+        # The provider has already converted the text to NUMBAR, NUMBR or YARN
+        user_input, value = entry
+        self.output.write(user_input + "\n")
+        self.update_to_symbol_table(var_name, value)
+
+    def select_if_branch(self, node: ASTNode):
+        """The STATEMENT_LIST an IF_ELSE node runs, or None when no branch applies."""
+        if not node.children or len(node.children) < 1:
+            raise ValueError("IF_ELSE node must have at least one child.")
+
+        # Iterate through the children to evaluate conditions
+        for child in node.children:
+            if child.node_type == NodeType.IF_STATEMENT or child.node_type == NodeType.ELSEIF_STATEMENT:
+                condition_node = child.children[0]
+                if self.evaluate_node(condition_node) == 'WIN':  # True condition
+                    return child.children[1]
+            elif child.node_type == NodeType.ELSE_STATEMENT:
+                # The ELSE statement has no condition, just a block
+                return child.children[0]
+        return None
+
+    def switch_bodies(self, node: ASTNode):
+        """
+        Yield the STATEMENT_LIST of every arm a SWITCH_CASE runs, in order. Every
+        matching arm runs and nothing falls through into an arm that doesn't
+        match; each case value is evaluated only after the arms before it have
+        run, and the default runs only when nothing matched.
+        """
+        if not node.children or len(node.children) < 2:
+            raise ValueError("SWITCH_CASE must have an expression and at least one CASE_LIST.")
+
+        # Evaluate the switch expression
+        switch_value = self.evaluate_node(node.children[0])  # The first child is the expression (e.g., choice)
+        for index, statement_list_node in self.switch_arms(node, switch_value):
+            yield statement_list_node
+
+    def switch_arms(self, node: ASTNode, switch_value, after=0, matched=False):
+        """
+        Yield (child index, STATEMENT_LIST) for the arms of a SWITCH_CASE that run
+        for `switch_value`, considering only children after `after`; `matched`
+        says whether an arm before them already ran. Switches whose case values
+        are all literals go straight to their matching arms via switch_table().
+        """
+        children = node.children
+        table = self.switch_table(node)
+        if table is not None:
+            arms, default_index = table
+            for index, statement_list_node, breaks in arms.get(switch_value, ()):
+                if index <= after:
+                    continue
+                if not matched and default_index is not None and index > default_index:
+                    break  # The default comes first
+                matched = True
+                yield index, statement_list_node
+                if breaks:
+                    return
+            if not matched and default_index is not None and default_index > after:
+                yield default_index, children[default_index].children[0]
+            return
+
+        # Traverse through CASE_LIST nodes
+        for index in range(after + 1, len(children)):
+            case_node = children[index]
+            if case_node.node_type == NodeType.CASE_LIST:
+                # The first child of CASE_LIST is the case literal
+                case_value = self.evaluate_node(case_node.children[0])
+
+                # Check if the switch value matches the case value
+                if switch_value == case_value:
+                    matched = True
+                    yield index, case_node.children[1]  # The STATEMENT_LIST
+                    # Check for a BREAK statement
+                    if len(case_node.children) > 2 and case_node.children[2].value == 'BREAK':
+                        return  # Exit the SWITCH_CASE
+            elif case_node.node_type == NodeType.DEFAULT_CASE:
+                # Run the DEFAULT_CASE if no match was found
+                if not matched:
+                    yield index, case_node.children[0]
+                    return
+        # If no match and no DEFAULT_CASE, do nothing
+
+    def switch_table(self, node: ASTNode):
+        """
+        The jump table for a SWITCH_CASE, built on its first run: a dict from each
+        case value to the (child index, STATEMENT_LIST, ends with GTFO) of every
+        arm with that value, in order, and the index of the default arm (or None).
+        None when a case value isn't a literal and so must be evaluated each time.
+        """
+        tables = self.switch_tables
+        if node in tables:
+            return tables[node]
+        children = node.children
+        table = None
+        if all(child.node_type != NodeType.CASE_LIST or child.children[0].node_type == NodeType.LITERAL
+               for child in children[1:]):
+            arms = {}
+            default_index = None
+            for index in range(1, len(children)):
+                case_node = children[index]
+                if case_node.node_type == NodeType.CASE_LIST:
+                    # Equal values share a key (2 and 2.0 too), keeping every such arm in order
+                    case_value = self.evaluate_node(case_node.children[0])
+                    breaks = len(case_node.children) > 2 and case_node.children[2].value == 'BREAK'
+                    arms[case_value] = arms.get(case_value, ()) + ((index, case_node.children[1], breaks),)
+                elif case_node.node_type == NodeType.DEFAULT_CASE and default_index is None:
+                    default_index = index
+            table = (arms, default_index)
+        tables[node] = table
+        return table
+
+    def loop_bodies(self, node: ASTNode):
+        """
+        Yield a LOOP's body once per iteration. The condition is checked before each
+        pass and the loop variable stepped after it, from a counter kept here.
+        """
+        direction = node.children[0].value  # "UPPIN" or "NERFIN"
+        loop_variable_node = node.children[1]  # Loop variable
+        condition_node = node.children[2]  # Loop condition
+        statement_list_node = node.children[3]  # Statements to execute in the loop
+
+        # Get the initial value of the loop variable
+        loop_variable = loop_variable_node.value
+        var_details = self.symbol_table.variables.get(loop_variable)
+        loop_variable_value = var_details.value
+        limits = self.limits
+
+        while True:
+            # Break the loop if the condition is not met
+            if self.evaluate_node(condition_node) != "WIN":
+                break
+
+            if limits is not None:
+                limits.step(self.symbol_table)
+            yield statement_list_node
+
+            # Update the loop variable
+            if direction == "UPPIN":
+                loop_variable_value += 1
+            elif direction == "NERFIN":
+                loop_variable_value -= 1
             else:
-                self.symbol_table.add_variable(name, 'YARN', value)
-        else:
-            self.symbol_table.add_variable(name, 'NOOB', value)
+                raise ValueError(f"Unknown loop direction: {direction}")
+
+            # Update the symbol table with the new value of the loop variable
+            self.update_to_symbol_table(loop_variable, loop_variable_value)
+
+    def enter_function(self, node: ASTNode):
+        """
+        Evaluate a FUNCTION_CALL's arguments, bind them in a copy of the current
+        scope and switch to it. Returns the function body and that scope, which the
+        caller makes current again once the body has run.
+        """
+        if self.limits is not None:
+            self.limits.step(self.symbol_table)
+        function_name = node.value  # Name of the function being called
+        arguments = [self.evaluate_typed(arg) for arg in node.children]
+
+        # Retrieve the function definition
+        function = self.symbol_table.get_function(function_name)
+        if not function:
+            raise ValueError(f"Undefined function: {function_name}")
+
+        # Check argument count
+        if len(arguments) != len(function["params"]):
+            raise ValueError(f"Function {function_name} expects {len(function['params'])} arguments, got {len(arguments)}")
+
+        # Manage local function scope
+        local_scope = self.symbol_table.copy()  # Clone the current symbol table for local scope isolation
+        for param, (arg_type, arg) in zip(function["params"], arguments):
+            if arg_type == 'NUMBAR':
+                arg = round(arg, 2)
+            local_scope.add_variable(param, arg_type, arg)
+
+        # Temporarily switch scopes for execution
+        self.symbol_table = local_scope
+        return function["body"], local_scope
 
     def interpret(self, node: ASTNode):
         """Interpret the AST, focusing on program logic."""
@@ -287,8 +622,14 @@ class ASTInterpreter:
             raise ValueError("Node is None during interpretation.")
         
         if node.node_type in [NodeType.PROGRAM, NodeType.STATEMENT_LIST]:
-            for child in node.children:
-                self.interpret(child)
+            limits = self.limits
+            if limits is None:
+                for child in node.children:
+                    self.interpret(child)
+            else:
+                for child in node.children:
+                    limits.step(self.symbol_table)
+                    self.interpret(child)
         
         elif node.node_type == NodeType.PRINT:
             if not node.children:
@@ -298,41 +639,30 @@ class ASTInterpreter:
             concatenated_output = "".join(values_to_print)  # Join with a space
             
             self.update_to_symbol_table('IT', concatenated_output)
-            print(concatenated_output)
+            self.output.write(concatenated_output + "\n")
 
         elif node.node_type == NodeType.INPUT:
             if not node.children or len(node.children) < 1:
                 pass
             var_name = node.value
-            # Prompt user for input using a Tkinter popup
-            user_input = simpledialog.askstring("Input", f"Enter value for {var_name}:", parent = self.master)
-            if user_input is None:
-                raise ValueError("No input provided by the user.")
-            # Try to convert the input to an appropriate type
-            try:
-                if '.' in user_input:
-                    value = float(user_input)
-                else:
-                    value = int(user_input)
-            except ValueError:
-                value = user_input  # Treat as string if conversion fails
-            print(user_input)
-            self.update_to_symbol_table(var_name, value)
+            if not self.input_provider.pending:
+                self.output.flush()  # Show any prompt before waiting for input
+            self.store_input(var_name, self.input_provider.read(var_name))
 
         elif node.node_type == NodeType.DECLARATION:
             if not node.children or len(node.children) < 1:
                 pass
             else:
                 var_name = node.value
-                value = self.evaluate_node(node.children[0])
-                self.add_to_symbol_table(var_name, value)
+                var_type, value = self.evaluate_typed(node.children[0])
+                self.store_typed(var_name, var_type, value, declare=True)
         
         elif node.node_type == NodeType.ASSIGNMENT:
             if not node.children or len(node.children) < 1:
                 raise ValueError("ASSIGNMENT node requires at least one child.")
             var_name = node.value
-            value = self.evaluate_node(node.children[0])
-            self.update_to_symbol_table(var_name, value)  # Update symbol table for assignments
+            var_type, value = self.evaluate_typed(node.children[0])
+            self.store_typed(var_name, var_type, value)  # Update symbol table for assignments
         
         elif node.node_type == NodeType.RECASTING:
             # Ensure there is at least one child node
@@ -371,36 +701,9 @@ class ASTInterpreter:
             self.symbol_table.update_variable(node.children[0].value, target_type, recast_value)
         
         elif node.node_type == NodeType.IF_ELSE:
-            if not node.children or len(node.children) < 1:
-                raise ValueError("IF_ELSE node must have at least one child.")
-
-            # Iterate through the children to evaluate conditions and execute blocks
-            for child in node.children:
-                if child.node_type == NodeType.IF_STATEMENT:
-                    # Handle the primary IF statement
-                    condition_node = child.children[0]
-                    statement_list_node = child.children[1]
-                    condition_result = self.evaluate_node(condition_node)
-                    
-                    if condition_result == 'WIN':  # True condition
-                        self.interpret(statement_list_node)
-                        return  # Exit after a block is executed
-                    
-                elif child.node_type == NodeType.ELSEIF_STATEMENT:
-                    # Handle ELSEIF statements
-                    condition_node = child.children[0]
-                    statement_list_node = child.children[1]
-                    condition_result = self.evaluate_node(condition_node)
-
-                    if condition_result == 'WIN':  # True condition
-                        self.interpret(statement_list_node)
-                        return  # Exit after a block is executed
-                    
-                elif child.node_type == NodeType.ELSE_STATEMENT:
-                    # Handle the ELSE statement (no condition, just execute block)
-                    statement_list_node = child.children[0]
-                    self.interpret(statement_list_node)
-                    return  # Exit after ELSE block is executed
+            statement_list_node = self.select_if_branch(node)
+            if statement_list_node is not None:
+                self.interpret(statement_list_node)
                 
         elif node.node_type == NodeType.TYPECASTING:
             if not node.children or len(node.children) < 1:
@@ -432,70 +735,13 @@ class ASTInterpreter:
             self.symbol_table.update_variable("IT", target_type, casted_value)
 
         elif node.node_type == NodeType.SWITCH_CASE:
-            if not node.children or len(node.children) < 2:
-                raise ValueError("SWITCH_CASE must have an expression and at least one CASE_LIST.")
-
-            # Evaluate the switch expression
-            switch_value = self.evaluate_node(node.children[0])  # The first child is the expression (e.g., choice)
-
-            # Traverse through CASE_LIST nodes
-            case_matched = False
-            for case_node in node.children[1:]:
-                if case_node.node_type == NodeType.CASE_LIST:
-                    # The first child of CASE_LIST is the case literal
-                    case_value = self.evaluate_node(case_node.children[0])
-
-                    # Check if the switch value matches the case value
-                    if switch_value == case_value:
-                        case_matched = True
-                        self.interpret(case_node.children[1])  # Execute the STATEMENT_LIST
-                        # Check for a BREAK statement
-                        if len(case_node.children) > 2 and case_node.children[2].value == 'BREAK':
-                            return  # Exit the SWITCH_CASE
-                elif case_node.node_type == NodeType.DEFAULT_CASE:
-                    # Execute the DEFAULT_CASE if no match was found
-                    if not case_matched:
-                        self.interpret(case_node.children[0])  # Execute the STATEMENT_LIST
-                        return
-            # If no match and no DEFAULT_CASE, do nothing
+            for statement_list_node in self.switch_bodies(node):
+                self.interpret(statement_list_node)
 
         elif node.node_type == NodeType.LOOP:
-            # if len(node.children) < 4:
-            #     raise ValueError("LOOP node must have a direction, loop variable, condition, and statement list.")
-
-            direction = node.children[0].value  # "UPPIN" or "NERFIN"
-            loop_variable_node = node.children[1]  # Loop variable
-            condition_node = node.children[2]  # Loop condition
-            statement_list_node = node.children[3]  # Statements to execute in the loop
-
-            # Get the initial value of the loop variable
-            loop_variable = loop_variable_node.value
-            var_details = self.symbol_table.variables.get(loop_variable)
-            loop_variable_value = var_details["value"]
-
-            while True:
-                # Evaluate the loop condition
-                condition_result = self.evaluate_node(condition_node)
-
-                # Break the loop if the condition is not met
-                if condition_result != "WIN":
-                    break
-
-                # Execute the loop body
+            for statement_list_node in self.loop_bodies(node):
                 self.interpret(statement_list_node)
 
-                # Update the loop variable
-                if direction == "UPPIN":
-                    loop_variable_value += 1
-                elif direction == "NERFIN":
-                    loop_variable_value -= 1
-                else:
-                    raise ValueError(f"Unknown loop direction: {direction}")
-
-                # Update the symbol table with the new value of the loop variable
-                self.update_to_symbol_table(loop_variable, loop_variable_value)
-                # self.symbol_table[loop_variable]["value"] = loop_variable_value
-
         elif node.node_type == NodeType.FUNCTION_DEFINITION:
             # Handle Function Definition
             function_name = node.value
@@ -507,50 +753,20 @@ class ASTInterpreter:
 
 
         elif node.node_type == NodeType.FUNCTION_CALL:
-            function_name = node.value  # Name of the function being called
-            arguments = [self.evaluate_node(arg) for arg in node.children]
-
-            # Retrieve the function definition
-            function = self.symbol_table.get_function(function_name)
-            if not function:
-                raise ValueError(f"Undefined function: {function_name}")
-
-            # Check argument count
-            if len(arguments) != len(function["params"]):
-                raise ValueError(f"Function {function_name} expects {len(function['params'])} arguments, got {len(arguments)}")
-
-            # Manage local function scope
-            local_scope = self.symbol_table.copy()  # Clone the current symbol table for local scope isolation
-            for param, arg in zip(function["params"], arguments):
-                if isinstance(arg, float):
-                    arg = round(arg, 2)
-                    local_scope.add_variable(param, 'NUMBAR', arg)
-                elif isinstance(arg, int):
-                    local_scope.add_variable(param, 'NUMBR', arg)
-                elif isinstance(arg, str):
-                    if arg == 'WIN' or arg == 'FAIL':
-                        local_scope.add_variable(param, 'TROOF', arg)
-                    else:
-                        local_scope.add_variable(param, 'YARN', arg)
-                else:
-                    local_scope.add_variable(param, 'NOOB', arg)
-                # local_scope.add_variable(param, "ANY", arg)  # Update local scope with arguments
-
-            # Temporarily switch scopes for execution
-            self.symbol_table = local_scope
+            body, local_scope = self.enter_function(node)
             try:
-                self.interpret(function["body"])  # Interpret the function body within this isolated scope
+                self.interpret(body)  # Interpret the function body within this isolated scope
             finally:
                 # Restore the original symbol table
                 self.symbol_table = local_scope  # Restore back to the parent symbol table
                 
         elif node.node_type == NodeType.FUNCTION_RETURN:
             # Handle function return logic
-            return_value = self.evaluate_node(node.children[0])  # Evaluate the return expression
-            self.update_to_symbol_table("IT", return_value)  # Store return value in the special variable `IT`
+            return_type, return_value = self.evaluate_typed(node.children[0])  # Evaluate the return expression
+            self.store_typed("IT", return_type, return_value)  # Store return value in the special variable `IT`
             # Signal that the function has returned
         else:
-            print(f"Unhandled node type: {node.node_type}")
+            self.output.write(f"Unhandled node type: {node.node_type}\n")
 
 class SemanticAnalyzer:
     def __init__(self, ast: ASTNode, symbol_table: SymbolTable):
@@ -564,24 +780,26 @@ class SemanticAnalyzer:
         return len(self.errors) == 0
     
     def traverse_ast(self, node: ASTNode):
-        """Recursively traverse the AST and perform semantic checks"""
-        if not node:
-            return
-        
-        # Type checking and semantic rules for different node types
-        if node.node_type == NodeType.ASSIGNMENT:
-            self.check_assignment(node)
-        elif node.node_type == NodeType.OPERATION:
-            self.check_operation(node)
-        elif node.node_type == NodeType.COMPARISON:
-            self.check_comparison(node)
-        # elif node.node_type == NodeType.FUNCTION_CALL:
-        #     self.check_function_call(node)
-        
-        # Recursively check children
-        for child in node.children:
-            if isinstance(child, ASTNode):
-                self.traverse_ast(child)
+        """Traverse the AST in preorder and perform semantic checks"""
+        # Explicit stack so deeply nested expressions don't exhaust the recursion limit
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if not node:
+                continue
+            
+            # Type checking and semantic rules for different node types
+            if node.node_type == NodeType.ASSIGNMENT:
+                self.check_assignment(node)
+            elif node.node_type == NodeType.OPERATION:
+                self.check_operation(node)
+            elif node.node_type == NodeType.COMPARISON:
+                self.check_comparison(node)
+            # elif node.node_type == NodeType.FUNCTION_CALL:
+            #     self.check_function_call(node)
+            
+            # Check children next, first child first
+            stack.extend(reversed(node.children))
     
     def check_assignment(self, node: ASTNode):
         """Check semantic rules for variable assignment"""
@@ -640,14 +858,25 @@ class SemanticAnalyzer:
         # Fallback type
         return 'NOOB'
 
+# How often the GUI checks the worker process for output, and how many messages it handles per check
+WORKER_POLL_MS = 30
+WORKER_MESSAGES_PER_POLL = 200
+
 class LOLCODECompilerGUI:
-    def __init__(self, master):
+    def __init__(self, master, dump_ast: bool = False, console_log=None, scrollback: int = CONSOLE_SCROLLBACK,
+                 input_file=None):
+        load_tk()
         self.master = master
+        self.dump_ast = dump_ast  # Also write the AST to stdout on each run
+        self.console_log = console_log  # File that receives the full console output of each run
+        self.scrollback = scrollback  # Lines the console keeps
+        self.input_file = input_file  # Pre-recorded GIMMEH values, used before asking with a dialog
         master.title("LOLCODE Compiler")
         master.geometry("1200x1000")
 
-        # Initialize lexemes as an empty dictionary first
-        self.lexemes = {}
+        # Worker process running the current program, and its message queues
+        self.worker = None
+        self.messages = self.replies = None
         
         # Create main frame
         self.main_frame = ttk.Frame(master)
@@ -699,21 +928,43 @@ class LOLCODECompilerGUI:
     def setup_tokens_list(self):
         tokens_frame = ttk.LabelFrame(self.main_frame, text="Tokens")
         tokens_frame.grid(row=1, column=1, sticky='nsew', padx=5, pady=5)
-        
-        self.tokens_tree = ttk.Treeview(tokens_frame, columns=('Lexeme', 'Token', 'Classification'), show='headings')
+
+        # Jump to the tokens of a source line
+        jump_frame = ttk.Frame(tokens_frame)
+        jump_frame.pack(side=tk.TOP, fill=tk.X, padx=5)
+        ttk.Label(jump_frame, text="Line:").pack(side=tk.LEFT)
+        self.jump_line = tk.StringVar()
+        jump_entry = ttk.Entry(jump_frame, textvariable=self.jump_line, width=8)
+        jump_entry.pack(side=tk.LEFT, padx=5)
+        jump_entry.bind('<Return>', lambda event: self.jump_to_line())
+        ttk.Button(jump_frame, text="Go", command=self.jump_to_line).pack(side=tk.LEFT)
+
+        self.tokens_tree = ttk.Treeview(tokens_frame, columns=('Line', 'Lexeme', 'Token', 'Classification'), show='headings')
+        self.tokens_tree.heading('Line', text='Line')
         self.tokens_tree.heading('Lexeme', text='Lexeme')
         self.tokens_tree.heading('Token', text='Token')
         self.tokens_tree.heading('Classification', text='Classification')
+        self.tokens_tree.column('Line', width=50)
         self.tokens_tree.column('Lexeme', width=150)
         self.tokens_tree.column('Token', width=100)
         self.tokens_tree.column('Classification', width=150)
-        self.tokens_tree.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
-        
-        # Populate the Treeview with lexemes and classifications
-        if len(self.lexemes) > 0:
-            for lexeme, token in self.lexemes.items():
-                classification = LEXEME_CLASSIFICATIONS.get(lexeme, 'Unknown')
-                self.tokens_tree.insert('', 'end', values=(lexeme, token, classification))
+        self.tokens_tree.pack(side=tk.LEFT, padx=5, pady=5, fill=tk.BOTH, expand=True)
+
+        tokens_scroll = ttk.Scrollbar(tokens_frame, orient=tk.VERTICAL)
+        tokens_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Only the rows in view exist; the list scrolls by rewriting them
+        row_height = ttk.Style().lookup('Treeview', 'rowheight')
+        self.token_list = VirtualTokenList(self.tokens_tree, tokens_scroll,
+                                           classify=lambda kind: LEXEME_CLASSIFICATIONS.get(kind, 'Unknown'),
+                                           row_height=int(row_height) if row_height else 20)
+
+    def jump_to_line(self):
+        try:
+            line = int(self.jump_line.get())
+        except ValueError:
+            return
+        self.token_list.jump_to_line(line)
         
     def setup_symbol_table(self):
         symbol_frame = ttk.LabelFrame(self.main_frame, text="Symbol Table")
@@ -731,6 +982,8 @@ class LOLCODECompilerGUI:
         symbol_scroll = ttk.Scrollbar(symbol_frame, orient=tk.VERTICAL, command=self.symbol_tree.yview)
         symbol_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.symbol_tree.config(yscrollcommand=symbol_scroll.set)
+
+        self.symbol_panel = SymbolTablePanel(self.symbol_tree, self.master)
         
     def setup_execute_button(self):
         execute_frame = ttk.Frame(self.main_frame)
@@ -740,7 +993,11 @@ class LOLCODECompilerGUI:
         self.execute_button = ttk.Button(execute_frame, text="Execute", command=self.execute_code, width=50)
 
         # Pack the button aligned to the left with additional internal padding
-        self.execute_button.pack(anchor='w', padx=10, pady=5, ipadx=10, ipady=5, fill='x')  # 'anchor=w' aligns it to the left, 'fill=x' stretches it
+        self.execute_button.pack(side=tk.LEFT, padx=10, pady=5, ipadx=10, ipady=5, fill='x', expand=True)  # 'fill=x' stretches it
+
+        # Stop ends a running program; it is only enabled while one is running
+        self.stop_button = ttk.Button(execute_frame, text="Stop", command=self.stop_execution, state='disabled')
+        self.stop_button.pack(side=tk.LEFT, padx=10, pady=5, ipadx=10, ipady=5)
     
     def setup_console(self):
         console_frame = ttk.LabelFrame(self.main_frame, text="Console")
@@ -754,6 +1011,8 @@ class LOLCODECompilerGUI:
         console_scroll = ttk.Scrollbar(console_frame, orient=tk.VERTICAL, command=self.console.yview)
         console_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.console.config(yscrollcommand=console_scroll.set)
+
+        self.console_sink = ConsoleSink(self.console, self.master, max_lines=self.scrollback, log_path=self.console_log)
         
         # Adjust row weights in the grid to make the console fill the remaining space
         self.main_frame.rowconfigure(4, weight=1)
@@ -767,11 +1026,13 @@ class LOLCODECompilerGUI:
                 self.text_editor.insert(tk.END, code)
     
     def execute_code(self):
+        if self.worker is not None:
+            return  # A program is already running
+
         # Clear previous results
-        self.tokens_tree.delete(*self.tokens_tree.get_children())
-        self.symbol_tree.delete(*self.symbol_tree.get_children())
-        self.console.config(state='normal')
-        self.console.delete('1.0', tk.END)
+        self.token_list.clear()
+        self.symbol_panel.clear()
+        self.console_sink.reset()
 
         # Get code from text editor
         code = self.text_editor.get('1.0', tk.END).strip()
@@ -779,74 +1040,105 @@ class LOLCODECompilerGUI:
         try:
             # Tokenization
             tokens = tokenize_lolcode(code)
-            self.lexemes = {token[1]: token[0] for token in tokens}
-
-            # Populate tokens list
-            for lexeme, token in self.lexemes.items():
-                classification = LEXEME_CLASSIFICATIONS.get(token, 'Unknown')
-                self.tokens_tree.insert('', 'end', values=(lexeme, token, classification))
-
-            # Syntax Analysis
-            syntax_analyzer = LOLCODESyntaxAnalyzer(tokens)
-            ast = syntax_analyzer.parse_program()
-            print(ast)
+            self.token_list.set_tokens(tokens)
 
-            # Semantic Analysis
-            semantic_analyzer = SemanticAnalyzer(ast, syntax_analyzer.symbol_table)
-            semantic_result = semantic_analyzer.analyze()
-
-            if semantic_result:
-                # Interpret and Execute Code One Node at a Time
-                interpreter = ASTInterpreter(ast, syntax_analyzer.symbol_table, master=self.master)
+            if self.dump_ast:
+                write_ast(LOLCODESyntaxAnalyzer(tokens).parse_program())
+        except Exception as e:
+            self.console_sink.write(f"Error: {str(e)}\n")
+            self.console_sink.close()
+            return
 
-                # Redirect stdout to capture console output
-                old_stdout = sys.stdout
-                redirected_output = sys.stdout = StringIO()
+        input_lines = []
+        if self.input_file:
+            try:
+                with open(self.input_file) as file:
+                    input_lines = file.read().splitlines()
+            except OSError as e:
+                self.console_sink.write(f"Error: {e}\n")
+                self.console_sink.close()
+                return
+
+        # Parsing, analysis and execution happen in a worker process, so the window
+        # stays responsive and Stop can end the run at any point
+        import multiprocessing
+        from interpreter_worker import run_program
+        context = multiprocessing.get_context('spawn')
+        self.messages = context.Queue()
+        self.replies = context.Queue()
+        self.worker = context.Process(target=run_program, args=(code, self.messages, self.replies, input_lines),
+                                      daemon=True)
+        self.worker.start()
+        self.execute_button.config(state='disabled')
+        self.stop_button.config(state='normal')
+        self.master.after(WORKER_POLL_MS, self.poll_worker)
+
+    def poll_worker(self):
+        """Drain the worker's messages into the console and Symbol Table, then poll again."""
+        if self.worker is None:
+            return
+        import queue
+        for _ in range(WORKER_MESSAGES_PER_POLL):
+            try:
+                kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'output':
+                self.console_sink.write(payload)
+            elif kind == 'symbols':
+                self.symbol_panel.update(payload)
+            elif kind == 'input':
+                load_tk()
+                answer = simpledialog.askstring("Input", f"Enter value for {payload}:", parent=self.master)
+                self.replies.put(answer)
+            elif kind == 'error':
+                self.console_sink.write(f"{payload}\n")
+            elif kind == 'done':
+                self.finish_run()
+                return
+        else:
+            # More messages are waiting, so come back without a delay
+            self.master.after_idle(self.poll_worker)
+            return
 
-                try:
-                    for node in ast.children:  # Process each child node individually
-                        try:
-                            interpreter.interpret(node)  # Interpret the current AST node
-                            output = redirected_output.getvalue()
-                            if output:
-                                self.console.insert(tk.END, output)  # Display the output
-                        except Exception as e:
-                            # Handle and display runtime error for the specific node
-                            self.console.insert(tk.END, f"Runtime Error: {e}\n")
-                            break  # Stop execution after the first error
-                        finally:
-                            # Clear the redirected output buffer
-                            redirected_output.seek(0)
-                            redirected_output.truncate(0)
-
-                        # Update Symbol Table dynamically after each node
-                        self.symbol_tree.delete(*self.symbol_tree.get_children())
-                        for var_name, details in semantic_analyzer.symbol_table.get_variables().items():
-                            var_type = details['type']
-                            var_value = details['value']
-                            self.symbol_tree.insert('', 'end', values=(var_name, var_type, var_value))
-
-                    self.console.config(state='disabled')
-
-                finally:
-                    # Restore stdout
-                    sys.stdout = old_stdout
-            else:
-                # Display semantic errors
-                for error in semantic_analyzer.errors:
-                    self.console.insert(tk.END, f"Semantic Error: {error}\n")
-                self.console.config(state='disabled')
+        if not self.worker.is_alive() and self.messages.empty():
+            self.console_sink.write("Error: the interpreter process exited unexpectedly\n")
+            self.finish_run()
+            return
+        self.master.after(WORKER_POLL_MS, self.poll_worker)
 
-        except Exception as e:
-            self.console.config(state='normal')
-            self.console.insert(tk.END, f"Error: {str(e)}\n")
-            self.console.config(state='disabled')
+    def stop_execution(self):
+        if self.worker is None:
+            return
+        self.worker.terminate()
+        self.console_sink.write("Execution stopped.\n")
+        self.finish_run()
 
+    def finish_run(self):
+        self.worker.join(timeout=1)
+        self.worker = None
+        self.messages = self.replies = None
+        self.console_sink.close()
+        self.symbol_panel.flush()
+        self.execute_button.config(state='normal')
+        self.stop_button.config(state='disabled')
 
 
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="LOLCODE compiler and interpreter GUI.")
+    parser.add_argument('--dump-ast', action='store_true', help="also write the AST to stdout on each run")
+    parser.add_argument('--console-log', default=None, metavar='PATH',
+                        help="write the full console output of each run to PATH")
+    parser.add_argument('--scrollback', type=int, default=CONSOLE_SCROLLBACK,
+                        help=f"lines kept in the console (default: {CONSOLE_SCROLLBACK})")
+    parser.add_argument('--input-file', default=None, metavar='PATH',
+                        help="take GIMMEH values from PATH, one per line, before asking with a dialog")
+    args = parser.parse_args()
+    load_tk()
     root = tk.Tk()
-    app = LOLCODECompilerGUI(root)
+    app = LOLCODECompilerGUI(root, dump_ast=args.dump_ast, console_log=args.console_log, scrollback=args.scrollback,
+                             input_file=args.input_file)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,9 +1,9 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
 from enum import Enum, auto
 from typing import List, Tuple, Optional
-from lexical_analyzer import tokenize_lolcode 
+from lexical_analyzer import tokenize_lolcode
+from io import StringIO
 import copy
+import sys
 
 class NodeType(Enum):
     PROGRAM = auto()
@@ -34,30 +34,136 @@ class NodeType(Enum):
     CASE_LIST = auto()
     DEFAULT_CASE = auto()
 
+# Prefix operators in expressions, by token kind, with the node value they produce
+ARITHMETIC_OPERATORS = {
+    'SUM_OF': 'SUM',
+    'DIFF_OF': 'DIFF',
+    'PRODUKT_OF': 'PRODUKT',
+    'QUOSHUNT_OF': 'QUOSHUNT',
+    'MOD_OF': 'MOD',
+    'BIGGR_OF': 'BIGGR',
+    'SMALLR_OF': 'SMALLR',
+    'SMOOSH': 'SMOOSH'
+}
+COMPARISON_OPERATORS = {
+    'BOTH_SAEM': 'EQ',
+    'DIFFRINT': 'NEQ'
+}
+BOOLEAN_OPERATORS = {
+    'BOTH_OF': 'AND',
+    'EITHER_OF': 'OR',
+    'WON_OF': 'XOR'
+}
+VARIADIC_BOOLEAN_OPERATORS = {
+    'ALL_OF': 'ALL',
+    'ANY_OF': 'ANY'
+}
+
+# Leaves share one immutable empty child sequence instead of a fresh list each
+_NO_CHILDREN = ()
+
 class ASTNode:
-    def __init__(self, node_type: NodeType, value: Optional[str] = None, token_type=None, children: Optional[List['ASTNode']] = None):
+    __slots__ = ('node_type', 'value', 'token_type', 'children', 'line')
+
+    def __init__(self, node_type: NodeType, value: Optional[str] = None, token_type=None,
+                 children: Optional[List['ASTNode']] = None, line: Optional[int] = None):
         self.node_type = node_type
         self.value = value
-        self.token_type = token_type 
-        self.children = children or []
-        
+        self.token_type = token_type
+        self.children = children if children else _NO_CHILDREN
+        self.line = line  # Source line of the token that starts the node
+
     def __repr__(self, level=0):
-        ret = "  " * level + f"{self.node_type.name}"
-        if self.value:
-            ret += f": {self.value}"
-        ret += "\n"
-        for child in self.children:
-            ret += child.__repr__(level + 1)
-        return ret
+        buffer = StringIO()
+        write_ast(self, buffer, level=level)
+        return buffer.getvalue()
+
+def write_ast(node, out=None, max_depth: Optional[int] = None, max_nodes: Optional[int] = None, level: int = 0) -> int:
+    """
+    Stream an indented dump of the tree rooted at `node` to the file-like `out`
+    (stdout by default), one line per node. Subtrees deeper than `max_depth` and
+    nodes past the first `max_nodes` are elided with a "..." line.
+    Returns the number of nodes written.
+    """
+    if out is None:
+        out = sys.stdout
+    written = 0
+    stack = [(node, 0)]
+    while stack:
+        current, depth = stack.pop()
+        indent = "  " * (level + depth)
+        if max_nodes is not None and written >= max_nodes:
+            out.write(f"{indent}...\n")
+            break
+        if current.value:
+            out.write(f"{indent}{current.node_type.name}: {current.value}\n")
+        else:
+            out.write(f"{indent}{current.node_type.name}\n")
+        written += 1
+
+        children = current.children
+        if not children:
+            continue
+        if max_depth is not None and depth >= max_depth:
+            out.write(f"{indent}  ...\n")
+            continue
+        # Push in reverse so the first child is written first
+        for child in reversed(children):
+            stack.append((child, depth + 1))
+    return written
+
+class ValueCell:
+    """
+    One variable's slot in a SymbolTable: its LOLCODE type tag and its value.
+    Much smaller than the {"type": ..., "value": ...} dict it replaces, and
+    still readable as one with cell["type"], cell["value"] and cell.get().
+    """
+
+    __slots__ = ('type', 'value')
+
+    def __init__(self, type: str, value: any):
+        self.type = type
+        self.value = value
+
+    def __getitem__(self, key):
+        if key == 'type':
+            return self.type
+        if key == 'value':
+            return self.value
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'type':
+            self.type = value
+        elif key == 'value':
+            self.value = value
+        else:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        if isinstance(other, ValueCell):
+            return self.type == other.type and self.value == other.value
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr({"type": self.type, "value": self.value})
 
 class SymbolTable:
     def __init__(self):
-        self.variables = {"IT":{"type": 'NOOB', "value": 'NOOB'}}
+        self.variables = {"IT": ValueCell('NOOB', 'NOOB')}
         self.functions = {}
         self.loops = {}
 
     def add_variable(self, name, type: str, value: any):
-        self.variables[name] = {"type": type, "value": value}
+        self.variables[name] = ValueCell(type, value)
 
     def get_variables(self):
         """Return all variables as a dictionary."""
@@ -92,17 +198,19 @@ class SymbolTable:
         """Update the value of an existing variable."""
         if value is None:
             value = 0 if type in ["NUMBR", "NUMBAR"] else ""
-        if name in self.variables:
-            self.variables[name]["value"] = value
-            self.variables[name]["type"] = type
-        else:
+        cell = self.variables.get(name)
+        if cell is None:
             raise KeyError(f"Variable '{name}' not found in symbol table.")
-        
+        cell.value = value
+        cell.type = type
+
     def copy(self):
         """Return a deep copy of the symbol table."""
         new_copy = SymbolTable()
-        new_copy.variables = copy.deepcopy(self.variables)
-        new_copy.functions = copy.deepcopy(self.functions)
+        # Values themselves are never changed in place, so new cells are enough
+        new_copy.variables = {name: ValueCell(cell.type, cell.value) for name, cell in self.variables.items()}
+        # Function bodies are read-only AST references, so only the entries are copied
+        new_copy.functions = {name: dict(function) for name, function in self.functions.items()}
         new_copy.loops = copy.deepcopy(self.loops)
         return new_copy
     
@@ -172,24 +280,27 @@ class LOLCODESyntaxAnalyzer:
     
     def parse_program(self) -> ASTNode:
         """<program> ::= HAI <linebreak> <statement_list> <linebreak> KTHXBYE"""
-        self.consume('HAI')
+        line = self.consume('HAI')[2]
         self.expect_newline()
 
-        while self.peek() and self.peek()[0] != 'KTHXBYE':
+        statement_list = ASTNode(NodeType.STATEMENT_LIST, line=line)     # An empty body
+        # The list stops at any block terminator; one other than KTHXBYE fails below
+        if self.peek() and self.peek()[0] != 'KTHXBYE':
             statement_list = self.parse_statement_list()
         
         self.consume('KTHXBYE')
-        return ASTNode(NodeType.PROGRAM, children=[statement_list])
+        return ASTNode(NodeType.PROGRAM, children=[statement_list], line=line)
     
     def parse_statement_list(self, allow_gtfo: bool = False) -> ASTNode:
         """<statement_list> ::= <statement> | <statement> <linebreak> <statement_list>"""
         statements = []
+        line = self.peek()[2] if self.peek() else None
         while self.peek() and self.peek()[0] not in {'KTHXBYE', 'OIC', 'OMGWTF', 'OMG', 'IM_OUTTA_YR', 'IF_U_SAY_SO'}:
             
             # Check for GTFO if allowed
             if allow_gtfo and self.peek() and self.peek()[0] == 'GTFO':
-                self.consume('GTFO')
-                statements.append(ASTNode(NodeType.STATEMENT_LIST, value='BREAK'))
+                gtfo_line = self.consume('GTFO')[2]
+                statements.append(ASTNode(NodeType.STATEMENT_LIST, value='BREAK', line=gtfo_line))
                 break
             
             statement = self.parse_statement()
@@ -198,7 +309,7 @@ class LOLCODESyntaxAnalyzer:
 
             self.expect_newline()
         
-        return ASTNode(NodeType.STATEMENT_LIST, children=statements)
+        return ASTNode(NodeType.STATEMENT_LIST, children=statements, line=line)
     
     def parse_statement(self) -> Optional[ASTNode]:
         """<statement> ::= <print> | <declaration> | <assignment> | <input> | <operation> | <comparison> | <if_statement> |
@@ -233,12 +344,15 @@ class LOLCODESyntaxAnalyzer:
         
         if token[0] == 'GTFO':
             self.consume('GTFO')
-            return ASTNode(NodeType.STATEMENT_LIST, value='BREAK')
+            return ASTNode(NodeType.STATEMENT_LIST, value='BREAK', line=token[2])
+
+        # R and IS NOW A are only valid after a variable, handled above
+        if token[0] in {'R', 'IS_NOW_A'}:
+            raise SyntaxError(f"Expected a variable before {token[1]} at line {token[2]}")
 
         statement_parsers = {
             'VISIBLE': self.parse_print,
             'WAZZUP': self.parse_declaration,
-            'R': self.parse_assignment,
             'GIMMEH': self.parse_input,
             'SUM_OF': self.parse_operation,
             'PRODUKT_OF': self.parse_operation,
@@ -252,7 +366,6 @@ class LOLCODESyntaxAnalyzer:
             'HOW_IZ_I': self.parse_function_definition,
             'I_IZ': self.parse_function_call,
             'MAEK': self.parse_typecasting,
-            'IS_NOW_A': self.parse_recasting,
             'FOUND_YR': self.parse_function_return,
         }
         
@@ -266,7 +379,7 @@ class LOLCODESyntaxAnalyzer:
         
     def parse_print(self) -> ASTNode:
         """<print> ::= VISIBLE varident | VISIBLE <expr> | VISIBLE <literal>"""
-        self.consume('VISIBLE')
+        line = self.consume('VISIBLE')[2]
     
         # Support for infinite arity print
         expressions = []
@@ -288,25 +401,26 @@ class LOLCODESyntaxAnalyzer:
             else:
                 break
         
-        return ASTNode(NodeType.PRINT, children=expressions)
+        return ASTNode(NodeType.PRINT, children=expressions, line=line)
     
     def parse_declaration(self) -> ASTNode:
         """<declaration> ::= WAZZUP <linebreak> <var_declaration> BUHBYE"""
-        self.consume('WAZZUP')  # Consume the declaration start token
+        line = self.consume('WAZZUP')[2]  # Consume the declaration start token
         
         declarations = [] 
         while self.peek() and self.peek()[0] != 'BUHBYE':
             self.consume('I_HAS_A')
             var_token = self.consume('VAR_ID')
+            var_line = var_token[2]
             # Parse optional initialization with ITZ
             if self.peek() and self.peek()[0] == 'ITZ':
                 self.consume('ITZ')
                 value = self.parse_expression()
                 inferred_type, inferred_value = self.infer_type_value(value)  # Infer the type from the expression
-                declarations.append(ASTNode(NodeType.DECLARATION, value=var_token[1], children=[value]))
+                declarations.append(ASTNode(NodeType.DECLARATION, value=var_token[1], children=[value], line=var_line))
                 self.symbol_table.add_variable(var_token[1], inferred_type, inferred_value)
             else:
-                declarations.append(ASTNode(NodeType.DECLARATION, value=var_token[1], children=[]))
+                declarations.append(ASTNode(NodeType.DECLARATION, value=var_token[1], children=[], line=var_line))
                 self.symbol_table.add_variable(var_token[1], 'NOOB', 'NOOB')  # Default type if no value
             
             # Ensure NEWLINE after each declaration
@@ -315,7 +429,7 @@ class LOLCODESyntaxAnalyzer:
         # Consume the end token
         self.consume('BUHBYE')
         
-        return ASTNode(NodeType.STATEMENT_LIST, children=declarations)
+        return ASTNode(NodeType.STATEMENT_LIST, children=declarations, line=line)
     
     def infer_type_value(self, value: ASTNode):
         """Infer the type of a variable based on its token type in the AST node."""
@@ -344,163 +458,126 @@ class LOLCODESyntaxAnalyzer:
         """<assignment> ::= varident R <literal> | varident R varident | varident R <expr>"""
         self.consume('R')
         value = self.parse_expression()
-        return ASTNode(NodeType.ASSIGNMENT, value=var_token[1], children=[value])
+        return ASTNode(NodeType.ASSIGNMENT, value=var_token[1], children=[value], line=var_token[2])
     
     def parse_input(self) -> ASTNode:
         """<input> ::= GIMMEH varident"""
-        self.consume('GIMMEH')
+        line = self.consume('GIMMEH')[2]
         var_token = self.consume('VAR_ID')
-        return ASTNode(NodeType.INPUT, value=var_token[1])
+        return ASTNode(NodeType.INPUT, value=var_token[1], line=line)
     
     def parse_operation(self) -> ASTNode:
         """<operation> ::= SUM OF <expr> AN <expr> | DIFF OF <expr> AN <expr> | PRODUKT OF <expr> AN <expr> | 
                            QUOSHUNT OF <expr> AN <expr> | MOD OF <expr> AN <expr> | BIGGR OF <expr> AN <expr> | 
                            SMALLR OF <expr> AN <expr> | SMOOSH <expr> AN <expr>..."""
-        operations = {
-            'SUM_OF': 'SUM',
-            'DIFF_OF': 'DIFF',
-            'PRODUKT_OF': 'PRODUKT',
-            'QUOSHUNT_OF': 'QUOSHUNT',
-            'MOD_OF': 'MOD',
-            'BIGGR_OF': 'BIGGR',
-            'SMALLR_OF': 'SMALLR',
-            'SMOOSH': 'SMOOSH'
-        }
-        
-        op_type = self.consume()[0]
-
-        # Special handling for SMOOSH with infinite arity
-        if op_type == 'SMOOSH':
-            expressions = []
-            while True:
-                expr = self.parse_expression()
-                expressions.append(expr)
-                
-                # Check if there are more expressions
-                if self.peek() and self.peek()[0] == 'AN':
-                    self.consume('AN')
-                else:
-                    break
-            
-            return ASTNode(NodeType.OPERATION, value=operations[op_type], children=expressions)
-    
-        # Existing binary operation parsing
-        left = self.parse_expression()
-        self.consume('AN')
-        right = self.parse_expression()
-        
-        return ASTNode(NodeType.OPERATION, value=operations[op_type], children=[left, right])
+        return self.parse_expression()
     
     def parse_comparison(self) -> ASTNode:
         """<comparison> ::= BOTH SAEM <expr> AN <expr> | DIFFRINT <expr> AN <expr> | BOTH SAEM <expr> AN BIGGR OF <expr> AN <expr> | 
                             BOTH SAEM <expr> AN SMALLR OF <expr> AN <expr> | DIFFRINT <expr> AN SMALLR OF <expr> AN <expr> | 
                             DIFFRINT <expr> AN BIGGR OF <expr> AN <expr>"""
-        comparisons = {
-            'BOTH_SAEM': 'EQ',
-            'DIFFRINT': 'NEQ'
-        }
-        
-        op_type = self.consume()[0]
-        left = self.parse_expression()
-        self.consume('AN')
-        right = self.parse_expression()
-        
-        return ASTNode(NodeType.COMPARISON, value=comparisons[op_type], children=[left, right])
+        return self.parse_expression()
     
     def parse_expression(self) -> ASTNode:
         """<expr> ::= varident | <literal> | <operation> | <boolean operation> | <comparison> | <typecasting>"""
-        token = self.peek()
-        if not token:
-            raise SyntaxError("Unexpected end of input")
-        
-        # Add boolean expression handling
-        boolean_ops = {
-            'NOT', 'BOTH_OF', 'EITHER_OF', 'WON_OF', 
-            'ALL_OF', 'ANY_OF'
-        }
-        
-        if token[0] == 'VAR_ID':
-            consumed_token = self.consume(token[0])
-            return ASTNode(NodeType.EXPRESSION,  value=consumed_token[1], token_type=consumed_token[0])
-        elif token[0] in {'NUMBR', 'NUMBAR', 'YARN', 'TROOF'}:
-            consumed_token = self.consume(token[0])
-            return ASTNode(NodeType.LITERAL, value=consumed_token[1], token_type=consumed_token[0])
-        elif token[0] in boolean_ops:
-            return self.parse_boolean_expr()
-        elif token[0] in {'SUM_OF', 'DIFF_OF', 'PRODUKT_OF', 'QUOSHUNT_OF', 'MOD_OF', 'BIGGR_OF', 'SMALLR_OF', 'SMOOSH'}:
-            return self.parse_operation()
-        elif token[0] in {'BOTH_SAEM', 'DIFFRINT'}:
-            return self.parse_comparison()
-        elif token[0] == 'MAEK':
-            return self.parse_typecasting()
-        
-        raise SyntaxError(f"Unexpected token in expression: {token}")
+        return self.parse_prefix_expression(boolean=False)
     
     def parse_boolean_expr(self) -> ASTNode:
         """<boolean operation> ::= BOTH OF <expr> AN <expr> | EITHER OF <expr> AN <expr> | WON OF <expr> AN <expr> | 
                                    NOT <expr> | ALL OF <expr> AN <expr>... MKAY | ANY OF <expr> AN <expr>... MKAY"""
-        token = self.peek()
-        
-        # Handle basic boolean literals
-        if token[0] in {'TROOF'}:
-            return ASTNode(NodeType.LITERAL, value=self.consume()[1])
-        
-        # Handle NOT operation
-        if token[0] == 'NOT':
-            self.consume('NOT')
-            expr = self.parse_boolean_expr()
-            return ASTNode(NodeType.BOOLEAN_OPERATION, value='NOT', children=[expr])
-        
-        # Handle binary boolean operations
-        binary_ops = {
-            'BOTH_OF': 'AND',
-            'EITHER_OF': 'OR',
-            'WON_OF': 'XOR'
-        }
-        
-        if token[0] in binary_ops:
-            op = self.consume()[0]
-            left = self.parse_boolean_expr()
-            self.consume('AN')
-            right = self.parse_boolean_expr()
-            return ASTNode(NodeType.BOOLEAN_OPERATION, value=binary_ops[op], children=[left, right])
-        
-        # Handle multi-arity operations: ALL OF and ANY OF
-        if token[0] in {'ALL_OF', 'ANY_OF'}:
-            op = self.consume()[0]
-            expressions = []
-            
-            # Collect expressions until MKAY
-            while self.peek() and self.peek()[0] != 'MKAY':
-                expr = self.parse_boolean_expr()
-                expressions.append(expr)
-                
-                # Consume AN if present
-                if self.peek() and self.peek()[0] == 'AN':
+        return self.parse_prefix_expression(boolean=True)
+    
+    def parse_prefix_expression(self, boolean: bool) -> ASTNode:
+        """
+        Parse one prefix expression using an explicit stack of open operators, so
+        nesting depth costs list entries rather than Python frames.
+        When `boolean` is set the operand is read as in <boolean operation>, where
+        a bare TROOF literal carries no token type.
+        """
+        pending = []  # Open operators as [node type, value, operands, arity, boolean operands, line]
+        while True:
+            token = self.peek()
+            if not token:
+                raise SyntaxError("Unexpected end of input")
+            kind, line = token[0], token[2]
+            operand = None
+
+            # An operator opens a frame and the loop moves on to its first operand
+            if kind in ARITHMETIC_OPERATORS:
+                self.consume()
+                pending.append([NodeType.OPERATION, ARITHMETIC_OPERATORS[kind], [],
+                                'variadic' if kind == 'SMOOSH' else 'binary', False, line])
+                boolean = False
+            elif kind in COMPARISON_OPERATORS:
+                self.consume()
+                pending.append([NodeType.COMPARISON, COMPARISON_OPERATORS[kind], [], 'binary', False, line])
+                boolean = False
+            elif kind == 'NOT':
+                self.consume('NOT')
+                pending.append([NodeType.BOOLEAN_OPERATION, 'NOT', [], 'unary', True, line])
+                boolean = True
+            elif kind in BOOLEAN_OPERATORS:
+                self.consume()
+                pending.append([NodeType.BOOLEAN_OPERATION, BOOLEAN_OPERATORS[kind], [], 'binary', True, line])
+                boolean = True
+            elif kind in VARIADIC_BOOLEAN_OPERATORS:
+                self.consume()
+                if self.peek() and self.peek()[0] != 'MKAY':
+                    pending.append([NodeType.BOOLEAN_OPERATION, VARIADIC_BOOLEAN_OPERATORS[kind], [], 'mkay', True, line])
+                    boolean = True
+                else:
+                    self.consume('MKAY')
+                    operand = ASTNode(NodeType.BOOLEAN_OPERATION, value=VARIADIC_BOOLEAN_OPERATORS[kind], line=line)
+            elif kind == 'MAEK':
+                self.consume('MAEK')
+                self.consume('A')
+                pending.append([NodeType.TYPECASTING, None, [], 'cast', False, line])
+                boolean = False
+
+            # Anything else must be an operand
+            elif kind == 'TROOF' and boolean:
+                operand = ASTNode(NodeType.LITERAL, value=self.consume()[1], line=line)
+            elif kind == 'VAR_ID':
+                consumed_token = self.consume(kind)
+                operand = ASTNode(NodeType.EXPRESSION, value=consumed_token[1], token_type=consumed_token[0], line=line)
+            elif kind in {'NUMBR', 'NUMBAR', 'YARN', 'TROOF'}:
+                consumed_token = self.consume(kind)
+                operand = ASTNode(NodeType.LITERAL, value=consumed_token[1], token_type=consumed_token[0], line=line)
+            else:
+                raise SyntaxError(f"Unexpected token in expression: {token}")
+
+            if operand is None:
+                continue
+
+            # Hand the operand to the innermost open operator, closing operators
+            # until one of them still expects another operand
+            while pending:
+                node_type, value, operands, arity, operand_boolean, operator_line = pending[-1]
+                operands.append(operand)
+                if arity == 'binary' and len(operands) == 1:
                     self.consume('AN')
-            
-            # Consume MKAY
-            self.consume('MKAY')
-            
-            return ASTNode(NodeType.BOOLEAN_OPERATION, value='ALL' if op == 'ALL_OF' else 'ANY', children=expressions)
-        
-        # Recursive handling of nested boolean expressions
-        if token[0] == 'BOTH_OF':
-            self.consume('BOTH_OF')
-            left = self.parse_boolean_expr()
-            self.consume('AN')
-            right = self.parse_boolean_expr()
-            return ASTNode(NodeType.BOOLEAN_OPERATION, value='AND', children=[left, right])
-        
-        if token[0] == 'EITHER_OF':
-            self.consume('EITHER_OF')
-            left = self.parse_boolean_expr()
-            self.consume('AN')
-            right = self.parse_boolean_expr()
-            return ASTNode(NodeType.BOOLEAN_OPERATION, value='OR', children=[left, right])
-        
-        # Fallback to regular expression parsing
-        return self.parse_expression()
+                    boolean = operand_boolean
+                    break
+                if arity == 'variadic' and self.peek() and self.peek()[0] == 'AN':
+                    self.consume('AN')
+                    boolean = operand_boolean
+                    break
+                if arity == 'mkay':
+                    if self.peek() and self.peek()[0] == 'AN':
+                        self.consume('AN')
+                    if self.peek() and self.peek()[0] != 'MKAY':
+                        boolean = operand_boolean
+                        break
+                    self.consume('MKAY')
+                elif arity == 'cast':
+                    type_token = self.consume()
+                    if type_token[0] not in {'NUMBR', 'NUMBAR', 'YARN', 'TROOF', 'TYPE'}:
+                        raise SyntaxError(f"Invalid type for typecasting: {type_token[0]}")
+                    value = type_token[1]
+                pending.pop()
+                operand = ASTNode(node_type, value=value, children=operands, line=operator_line)
+            else:
+                return operand
     
     def parse_if_statement(self, condition: ASTNode) -> ASTNode:
         """<if_statement> ::= <expr> O RLY? <linebreak> YA RLY <linebreak> <statement_list> [MEBBE <expr> <linebreak> <statement_list>] 
@@ -509,7 +586,7 @@ class LOLCODESyntaxAnalyzer:
         self.expect_newline()
 
         # Parse YA_RLY and the true block
-        self.consume('YA_RLY')
+        true_line = self.consume('YA_RLY')[2]
         self.expect_newline()
         true_block = []
         while self.peek() and self.peek()[0] not in {'MEBBE', 'NO_WAI', 'OIC'}:
@@ -519,19 +596,20 @@ class LOLCODESyntaxAnalyzer:
         # Parse MEBBE blocks (optional)
         alternative_blocks = []
         while self.peek() and self.peek()[0] == 'MEBBE':
-            self.consume('MEBBE')
+            alt_line = self.consume('MEBBE')[2]
             alt_condition = self.parse_expression()
             alt_block = []  # Initialize alt_block inside the loop
             self.expect_newline()
             while self.peek() and self.peek()[0] not in {'MEBBE', 'NO_WAI', 'OIC'}:
                 alt_block.append(self.parse_statement())
                 self.expect_newline()
-            alternative_blocks.append((alt_condition, alt_block))
+            alternative_blocks.append((alt_condition, alt_block, alt_line))
 
         # Parse NO_WAI block (optional)
         false_block = []
+        false_line = None
         if self.peek() and self.peek()[0] == 'NO_WAI':
-            self.consume('NO_WAI')
+            false_line = self.consume('NO_WAI')[2]
             self.expect_newline()
             while self.peek() and self.peek()[0] != 'OIC':
                 false_block.append(self.parse_statement())
@@ -544,21 +622,24 @@ class LOLCODESyntaxAnalyzer:
             raise SyntaxError("Expected OIC to close the if-then statement")
 
         # Construct AST node
-        children = [ASTNode(NodeType.IF_STATEMENT, children=[condition, ASTNode(NodeType.STATEMENT_LIST, children=true_block)])]
+        children = [ASTNode(NodeType.IF_STATEMENT, children=[
+            condition, ASTNode(NodeType.STATEMENT_LIST, children=true_block, line=true_line)], line=true_line)]
 
         # Add alternative blocks as ELIF_ELSE nodes
         if alternative_blocks:
-            for cond, block in alternative_blocks:
-                elif_node = ASTNode(NodeType.ELSEIF_STATEMENT, children=[cond, ASTNode(NodeType.STATEMENT_LIST, children=block)])
+            for cond, block, alt_line in alternative_blocks:
+                elif_node = ASTNode(NodeType.ELSEIF_STATEMENT, children=[
+                    cond, ASTNode(NodeType.STATEMENT_LIST, children=block, line=alt_line)], line=alt_line)
                 children.append(elif_node)
 
         # Add the ELSE block as an ELSE_STATEMENT node if it exists
         if false_block:
-            else_node = ASTNode(NodeType.ELSE_STATEMENT, children=[ASTNode(NodeType.STATEMENT_LIST, children=false_block)])
+            else_node = ASTNode(NodeType.ELSE_STATEMENT, children=[
+                ASTNode(NodeType.STATEMENT_LIST, children=false_block, line=false_line)], line=false_line)
             children.append(else_node)
 
         # Return the umbrella IF_ELSE node
-        return ASTNode(NodeType.IF_ELSE, children=children)
+        return ASTNode(NodeType.IF_ELSE, children=children, line=condition.line)
 
     # Placeholder methods for advanced parsing
     def parse_switch_case(self, condition: ASTNode) -> ASTNode:
@@ -571,7 +652,7 @@ class LOLCODESyntaxAnalyzer:
 
         """<case_list> ::= OMG <literal> <statement_list> [GTFO] | OMG <literal> <statement_list> [GTFO] <case_list>"""
         while self.peek() and self.peek()[0] == 'OMG':
-            self.consume('OMG')
+            case_line = self.consume('OMG')[2]
             case_value = self.parse_expression()  # Parse the case value (e.g., literal or variable)
             self.expect_newline()
 
@@ -581,12 +662,12 @@ class LOLCODESyntaxAnalyzer:
                 self.expect_newline()
 
             cases.append(ASTNode(NodeType.CASE_LIST, children=[
-                case_value, ASTNode(NodeType.STATEMENT_LIST, children=case_block)
-            ]))
+                case_value, ASTNode(NodeType.STATEMENT_LIST, children=case_block, line=case_line)
+            ], line=case_line))
 
         # Parse OMGWTF default case (optional)
         if self.peek() and self.peek()[0] == 'OMGWTF':
-            self.consume('OMGWTF')
+            default_line = self.consume('OMGWTF')[2]
             self.expect_newline()
 
             default_case_block = []
@@ -594,7 +675,7 @@ class LOLCODESyntaxAnalyzer:
                 default_case_block.append(self.parse_statement())
                 self.expect_newline()
 
-            default_case = ASTNode(NodeType.DEFAULT_CASE, children=default_case_block)
+            default_case = ASTNode(NodeType.DEFAULT_CASE, children=default_case_block, line=default_line)
 
         # Consume OIC to close the switch-case statement
         if self.peek() and self.peek()[0] == 'OIC':
@@ -608,18 +689,19 @@ class LOLCODESyntaxAnalyzer:
         if default_case:
             children.append(default_case)  # Add the default case if it exists
 
-        return ASTNode(NodeType.SWITCH_CASE, children=children)
+        return ASTNode(NodeType.SWITCH_CASE, children=children, line=condition.line)
     
     def parse_loop(self) -> ASTNode:
         """<loop> ::= IM IN YR loopident <loop_operation> YR varident [TIL <expr> | WILE <expr>] <linebreak> <statement_list> 
                       IM OUTTA YR loopident"""
         # Consume IM IN YR and loop identifier
-        self.consume('IM_IN_YR')
+        line = self.consume('IM_IN_YR')[2]
         loop_name = self.consume('VAR_ID')[1]
         
         # Parse loop operation (UPPIN or NERFIN)
-        if not self.peek() or self.peek()[0] not in {'UPPIN', 'NERFIN'}:
-            raise SyntaxError(f"Expected UPPIN or NERFIN, found {self.peek()[0]} at line {self.peek()[2]}")
+        token = self.peek()
+        if not token or token[0] not in {'UPPIN', 'NERFIN'}:
+            raise SyntaxError(f"Expected UPPIN or NERFIN, found {token[0] if token else 'EOF'} at line {token[2] if token else 'EOF'}")
         
         mode = self.consume()[0]  # Consume UPPIN or NERFIN
         
@@ -634,7 +716,7 @@ class LOLCODESyntaxAnalyzer:
             if condition_type == 'TIL':
                 # For TIL, negate the condition
                 condition = ASTNode(NodeType.UNARY_OP, value='NOT', 
-                    children=[self.parse_expression()])
+                    children=[self.parse_expression()], line=line)
             else:  # WILE
                 condition = self.parse_expression()
         else:
@@ -658,16 +740,16 @@ class LOLCODESyntaxAnalyzer:
         self.symbol_table.add_loop(loop_name)
         
         return ASTNode(NodeType.LOOP, value=loop_name, children=[
-            ASTNode(NodeType.LITERAL, value=mode),
-            ASTNode(NodeType.EXPRESSION, value=var_token),
+            ASTNode(NodeType.LITERAL, value=mode, line=line),
+            ASTNode(NodeType.EXPRESSION, value=var_token, line=line),
             condition,
             body
-        ])
+        ], line=line)
     
     def parse_function_definition(self) -> ASTNode:
         """<function_definition> ::= HOW IZ I funcident [YR varident [AN YR varident ...]]
                                      <linebreak> <statement_list> IF U SAY SO"""
-        self.consume('HOW_IZ_I')
+        line = self.consume('HOW_IZ_I')[2]
         func_name = self.consume('VAR_ID')[1]
         
         # Parameters
@@ -698,13 +780,14 @@ class LOLCODESyntaxAnalyzer:
         return ASTNode(NodeType.FUNCTION_DEFINITION, 
                     value=func_name, 
                     children=[ASTNode(NodeType.PARAMETER_LIST, 
-                                      children=[ASTNode(NodeType.LITERAL, value=param) for param in params]),
+                                      children=[ASTNode(NodeType.LITERAL, value=param, line=line) for param in params],
+                                      line=line),
                                       body
-                    ])
+                    ], line=line)
     
     def parse_function_call(self) -> ASTNode:
         """<function_call> ::= I IZ funcident [YR <expr> [AN YR <expr>...]] MKAY"""
-        self.consume('I_IZ')
+        line = self.consume('I_IZ')[2]
         func_name = self.consume('VAR_ID')[1]
         
         # Arguments
@@ -721,25 +804,16 @@ class LOLCODESyntaxAnalyzer:
         
         return ASTNode(NodeType.FUNCTION_CALL, 
                        value=func_name, 
-                       children=args)
+                       children=args,
+                       line=line)
     
     def parse_typecasting(self) -> ASTNode:
         """<typecasting> ::= MAEK <expr> A <literal>"""
-        self.consume('MAEK')
-        self.consume('A')
-        expr = self.parse_expression()
-        type_token = self.consume()
-        
-        # Validate type
-        valid_types = {'NUMBR', 'NUMBAR', 'YARN', 'TROOF', 'TYPE'}
-        if type_token[0] not in valid_types:
-            raise SyntaxError(f"Invalid type for typecasting: {type_token[0]}")
-        
-        return ASTNode(NodeType.TYPECASTING, value=type_token[1], children=[expr])
+        return self.parse_expression()
 
     def parse_recasting(self, var_name: str) -> ASTNode:
         """<recasting> ::= varident IS NOW A <literal>"""
-        self.consume('IS_NOW_A')
+        line = self.consume('IS_NOW_A')[2]
         type_token = self.consume()
         
         # Validate type
@@ -755,19 +829,37 @@ class LOLCODESyntaxAnalyzer:
         self.symbol_table.add_variable(var_name, type_token[1], current_value)
         
         return ASTNode(NodeType.RECASTING, value=type_token[1], children=[
-            ASTNode(NodeType.EXPRESSION, value=var_name)])
+            ASTNode(NodeType.EXPRESSION, value=var_name, line=line)], line=line)
     
     def parse_function_return(self) -> ASTNode:
         """<function_return> ::= FOUND YR <expr>"""
-        self.consume('FOUND_YR')
+        line = self.consume('FOUND_YR')[2]
         return_value = self.parse_expression()
         
-        return ASTNode(NodeType.FUNCTION_RETURN, children=[return_value])
+        return ASTNode(NodeType.FUNCTION_RETURN, children=[return_value], line=line)
     
 
+# Tkinter is only needed by the GUI, so it is imported on first use by load_tk()
+tk = filedialog = messagebox = ttk = None
+
+def load_tk():
+    """Import the Tkinter modules used by the GUI into this module."""
+    global tk, filedialog, messagebox, ttk
+    if tk is None:
+        import tkinter
+        import tkinter.filedialog
+        import tkinter.messagebox
+        import tkinter.ttk
+        tk = tkinter
+        filedialog = tkinter.filedialog
+        messagebox = tkinter.messagebox
+        ttk = tkinter.ttk
+
 class LOLCODEParserGUI:
-    def __init__(self, master):
+    def __init__(self, master, dump_ast: bool = False):
+        load_tk()
         self.master = master
+        self.dump_ast = dump_ast  # Also write the AST to stdout after each parse
         master.title("LOLCODE Parser")
         master.geometry("600x500")
 
@@ -846,7 +938,8 @@ class LOLCODEParserGUI:
             # Parse
             analyzer = LOLCODESyntaxAnalyzer(tokens)
             ast = analyzer.parse_program()
-            print(ast)
+            if self.dump_ast:
+                write_ast(ast)
 
             # Display AST
             self.ast_text.insert(tk.END, "ABSTRACT SYNTAX TREE:\n")
@@ -871,8 +964,9 @@ class LOLCODEParserGUI:
             messagebox.showerror("Parsing Error", str(e))
 
 def main():
+    load_tk()
     root = tk.Tk()
-    LOLCODEParserGUI(root)
+    LOLCODEParserGUI(root, dump_ast='--dump-ast' in sys.argv[1:])
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,233 @@
+import argparse
+import os
+import random
+import sys
+
+# Operators that stay well-defined for any integer operands
+SAFE_OPERATORS = ['SUM OF', 'DIFF OF', 'BIGGR OF', 'SMALLR OF']
+# Operators whose right operand must be a non-zero literal
+DIVIDING_OPERATORS = ['MOD OF', 'QUOSHUNT OF']
+
+# Relative weight of each kind of top-level statement
+DEFAULT_MIX = {'assign': 4, 'print': 2, 'smoosh': 1, 'loop': 1, 'switch': 1, 'call': 1, 'if': 1, 'input': 0}
+
+class WorkloadGenerator:
+    """
+    Writes a valid, reproducible LOLCODE program line by line, so even programs of
+    millions of lines never have to fit in memory. GIMMEH values go to `input_out`.
+    """
+
+    def __init__(self, out, input_out=None, seed=0, declarations=20, statements=100, target_lines=None,
+                 nesting=3, smoosh_arity=3, smoosh_accumulate=False, loop_trips=10, cases=4,
+                 functions=2, recursion_depth=5, mix=None):
+        self.out = out
+        self.input_out = input_out
+        self.rng = random.Random(seed)
+        self.declarations = max(1, declarations)
+        self.statements = statements
+        self.target_lines = target_lines
+        self.nesting = max(1, nesting)
+        self.smoosh_arity = max(2, smoosh_arity)
+        self.smoosh_accumulate = smoosh_accumulate
+        self.loop_trips = loop_trips
+        self.cases = cases
+        self.functions = functions
+        self.recursion_depth = recursion_depth
+        self.lines = 0
+        self.loop_count = 0
+
+        mix = dict(DEFAULT_MIX if mix is None else mix)
+        # Statement kinds that the configuration switches off can't be picked
+        if loop_trips <= 0:
+            mix['loop'] = 0
+        if cases <= 0:
+            mix['switch'] = 0
+        if functions <= 0:
+            mix['call'] = 0
+        if input_out is None:
+            mix['input'] = 0
+        self.kinds = [kind for kind, weight in mix.items() if weight > 0]
+        self.weights = [mix[kind] for kind in self.kinds]
+        if not self.kinds:
+            raise ValueError("The statement mix must enable at least one kind of statement.")
+
+    def line(self, text, indent=1):
+        self.out.write("    " * indent + text + "\n")
+        self.lines += 1
+
+    def variable(self):
+        return f"v{self.rng.randrange(self.declarations)}"
+
+    def operand(self):
+        if self.rng.random() < 0.6:
+            return self.variable()
+        # The lexer has no negative literals after whitespace, so stay non-negative
+        return str(self.rng.randint(0, 50))
+
+    def expression(self, depth=None):
+        """A prefix expression exactly `depth` operators deep, built without recursion."""
+        depth = self.nesting if depth is None else depth
+        operators = []
+        right_operands = []
+        for _ in range(depth):
+            if self.rng.random() < 0.2:
+                operators.append(self.rng.choice(DIVIDING_OPERATORS))
+                right_operands.append(str(self.rng.randint(2, 9)))
+            else:
+                operators.append(self.rng.choice(SAFE_OPERATORS))
+                right_operands.append(self.operand())
+        # Innermost operator comes last, so its right operand is the first to close
+        return " ".join(operators) + " " + self.operand() + "".join(f" AN {operand}" for operand in reversed(right_operands))
+
+    def bounded_expression(self):
+        """An expression wrapped in MOD so repeated assignment can't grow values without bound."""
+        return f"MOD OF {self.expression()} AN 997"
+
+    def simple_statement(self, indent):
+        """A one-line statement that is safe inside loops, cases and branches."""
+        if self.rng.random() < 0.7:
+            self.line(f"{self.variable()} R {self.bounded_expression()}", indent)
+        else:
+            self.line(f"VISIBLE {self.expression()}", indent)
+
+    def write_header(self):
+        self.line("HAI", 0)
+        self.line("WAZZUP")
+        for index in range(self.declarations):
+            self.line(f"I HAS A v{index} ITZ {self.rng.randint(0, 100)}", 2)
+        for name, value in [('acc', '""'), ('msg', '""'), ('sel', '0'), ('depth', '0')]:
+            self.line(f"I HAS A {name} ITZ {value}", 2)
+        if self.loop_trips > 0:
+            self.line("I HAS A i0 ITZ 0", 2)
+        self.line("BUHBYE")
+
+    def write_functions(self):
+        for index in range(self.functions):
+            self.line(f"HOW IZ I f{index} YR p{index}a AN YR p{index}b")
+            self.line(f"FOUND YR MOD OF SUM OF PRODUKT OF p{index}a AN {self.rng.randint(2, 9)} AN p{index}b AN 997", 2)
+            self.line("IF U SAY SO")
+        if self.recursion_depth > 0:
+            # Counts down to zero; the interpreter needs several Python frames per level
+            self.line("HOW IZ I rec YR n")
+            self.line("DIFFRINT n AN 0", 2)
+            self.line("O RLY?", 2)
+            self.line("YA RLY", 3)
+            self.line("I IZ rec YR DIFF OF n AN 1", 4)
+            self.line("OIC", 2)
+            self.line("FOUND YR n", 2)
+            self.line("IF U SAY SO")
+
+    def write_statement(self, kind):
+        if kind == 'assign':
+            self.line(f"{self.variable()} R {self.bounded_expression()}")
+        elif kind == 'print':
+            self.line(f"VISIBLE {self.expression()}")
+        elif kind == 'smoosh':
+            parts = [f'"s{self.rng.randrange(100)}"' if self.rng.random() < 0.5 else self.variable()
+                     for _ in range(self.smoosh_arity)]
+            if self.smoosh_accumulate:
+                self.line(f"acc R SMOOSH acc AN {' AN '.join(parts[1:])}")
+            else:
+                self.line(f"msg R SMOOSH {' AN '.join(parts)}")
+        elif kind == 'loop':
+            name = f"loop{self.loop_count}"
+            self.loop_count += 1
+            self.line("i0 R 0")
+            self.line(f"IM IN YR {name} UPPIN YR i0 TIL BOTH SAEM i0 AN {self.loop_trips}")
+            for _ in range(self.rng.randint(1, 3)):
+                self.simple_statement(2)
+            self.line(f"IM OUTTA YR {name}")
+        elif kind == 'switch':
+            self.line(f"sel R MOD OF {self.variable()} AN {self.cases}")
+            self.line("sel")
+            self.line("WTF?")
+            for case in range(self.cases):
+                self.line(f"OMG {case}", 2)
+                self.simple_statement(3)
+                self.line("GTFO", 3)
+            self.line("OMGWTF", 2)
+            self.simple_statement(3)
+            self.line("OIC")
+        elif kind == 'call':
+            if self.recursion_depth > 0 and self.rng.random() < 0.2:
+                self.line(f"I IZ rec YR {self.recursion_depth}")
+                self.line("depth R IT")
+            else:
+                self.line(f"I IZ f{self.rng.randrange(self.functions)} YR {self.operand()} AN YR {self.operand()}")
+                self.line(f"{self.variable()} R IT")
+        elif kind == 'if':
+            self.line(f"BOTH SAEM {self.variable()} AN BIGGR OF {self.variable()} AN {self.operand()}")
+            self.line("O RLY?")
+            self.line("YA RLY", 2)
+            self.simple_statement(3)
+            self.line("NO WAI", 2)
+            self.simple_statement(3)
+            self.line("OIC")
+        elif kind == 'input':
+            self.line(f"GIMMEH {self.variable()}")
+            self.input_out.write(f"{self.rng.randint(-100, 100)}\n")
+
+    def generate(self):
+        self.write_header()
+        self.write_functions()
+        written = 0
+        while True:
+            if self.target_lines is not None:
+                if self.lines >= self.target_lines - 1:
+                    break
+            elif written >= self.statements:
+                break
+            self.write_statement(self.rng.choices(self.kinds, self.weights)[0])
+            written += 1
+        self.line("KTHXBYE", 0)
+        return self.lines
+
+def parse_mix(text):
+    """Parse 'assign=4,print=2,...' into a weight per statement kind."""
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        kind, _, weight = item.partition('=')
+        if kind not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown statement kind '{kind}' (expected one of {', '.join(DEFAULT_MIX)})")
+        mix[kind] = int(weight)
+    return mix
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate reproducible LOLCODE programs for scaling tests.")
+    parser.add_argument('-o', '--output', required=True, help="program file to write (.lol); GIMMEH input goes to the matching .in file")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument('--declarations', type=int, default=20, help="variables declared in WAZZUP (default: 20)")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--statements', type=int, default=100, help="top-level statements (default: 100)")
+    size.add_argument('--lines', type=int, default=None, help="stop once the program reaches about this many lines")
+    parser.add_argument('--nesting', type=int, default=3, help="operators per expression (default: 3)")
+    parser.add_argument('--smoosh-arity', type=int, default=3, help="operands per SMOOSH (default: 3)")
+    parser.add_argument('--smoosh-accumulate', action='store_true', help="append to one growing YARN (acc R SMOOSH acc AN ...)")
+    parser.add_argument('--loop-trips', type=int, default=10, help="iterations per loop, 0 for no loops (default: 10)")
+    parser.add_argument('--cases', type=int, default=4, help="OMG arms per WTF? switch, 0 for no switches (default: 4)")
+    parser.add_argument('--functions', type=int, default=2, help="HOW IZ I functions, 0 for no calls (default: 2)")
+    parser.add_argument('--recursion-depth', type=int, default=5, help="depth of the recursive function, 0 to leave it out (default: 5)")
+    parser.add_argument('--mix', type=parse_mix, default=None,
+                        help="statement weights, e.g. 'assign=4,print=2,smoosh=1,loop=1,switch=1,call=1,if=1,input=1'")
+    args = parser.parse_args(argv)
+
+    input_path = os.path.splitext(args.output)[0] + '.in'
+    mix = args.mix or DEFAULT_MIX
+    with open(args.output, 'w') as out:
+        input_out = open(input_path, 'w') if mix.get('input', 0) > 0 else None
+        try:
+            generator = WorkloadGenerator(out, input_out, seed=args.seed, declarations=args.declarations,
+                                          statements=args.statements, target_lines=args.lines,
+                                          nesting=args.nesting, smoosh_arity=args.smoosh_arity,
+                                          smoosh_accumulate=args.smoosh_accumulate, loop_trips=args.loop_trips,
+                                          cases=args.cases, functions=args.functions,
+                                          recursion_depth=args.recursion_depth, mix=mix)
+            lines = generator.generate()
+        finally:
+            if input_out:
+                input_out.close()
+    print(f"wrote {lines} lines to {args.output}" + (f" and input to {input_path}" if input_out else ""), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import sys
+
+# SMOOSH results at least this long are kept as a Yarn instead of a str
+ROPE_THRESHOLD = 64
+
+class Yarn:
+    """
+    A long YARN value built up by SMOOSH. The pieces are kept in a list shared
+    with the Yarn it was appended to, so `acc R SMOOSH acc AN piece` adds a
+    piece in amortized O(1) instead of copying the whole string. A Yarn owns
+    the first `count` pieces; appending to one whose pieces are already shared
+    further copies them first, so every Yarn keeps its value. The text is only
+    joined, once, when something needs it as a str (see str()).
+    """
+
+    __slots__ = ('parts', 'count', 'length', 'flat')
+
+    def __init__(self, parts, length):
+        self.parts = parts
+        self.count = len(parts)
+        self.length = length
+        self.flat = None
+
+    def append(self, pieces):
+        """A new Yarn with `pieces` (strs) added at the end."""
+        parts = self.parts
+        if len(parts) != self.count:
+            parts = parts[:self.count]
+        parts.extend(pieces)
+        return Yarn(parts, self.length + sum(map(len, pieces)))
+
+    def __str__(self):
+        if self.flat is None:
+            self.flat = "".join(self.parts[:self.count] if len(self.parts) != self.count else self.parts)
+        return self.flat
+
+    def __len__(self):
+        return self.length
+
+    def __eq__(self, other):
+        if isinstance(other, (str, Yarn)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __sizeof__(self):
+        # The text it stands for, rather than the shared list of pieces
+        return object.__sizeof__(self) + sys.getsizeof('') + self.length
+
+    # A Yarn never changes, so copies of a symbol table can share it
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+def smoosh(values):
+    """
+    Concatenate SMOOSH operands. A Yarn first operand is appended to in place;
+    otherwise results of ROPE_THRESHOLD characters or more become a new Yarn.
+    """
+    first = values[0]
+    pieces = [str(value) for value in values[1:]]
+    if type(first) is Yarn:
+        return first.append(pieces)
+    pieces.insert(0, str(first))
+    length = sum(map(len, pieces))
+    if length >= ROPE_THRESHOLD:
+        return Yarn(pieces, length)
+    return "".join(pieces)
+
+def flatten(value):
+    """`value` with any Yarn turned into a plain str."""
+    return str(value) if type(value) is Yarn else value